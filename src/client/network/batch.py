@@ -0,0 +1,32 @@
+"""
+Batch frame reader shared by the client networks.
+
+A MSG_TYPE_BATCH frame is the batch type byte followed by complete
+messages, each prefixed with its length in BATCH_LENGTH_FORMAT.
+"""
+
+import struct
+from typing import Iterator
+
+from common.config import BATCH_LENGTH_FORMAT, BATCH_LENGTH_SIZE
+
+_BATCH_LENGTH = struct.Struct(BATCH_LENGTH_FORMAT)
+
+
+def iter_batch(data: bytes) -> Iterator[bytes]:
+    """
+    Split a MSG_TYPE_BATCH frame into its messages.
+
+    Args:
+        data: Whole batch frame, including its type byte.
+
+    Yields:
+        Each message in order, including its own type byte.
+    """
+    offset = 1
+    end = len(data)
+    while offset + BATCH_LENGTH_SIZE <= end:
+        (size,) = _BATCH_LENGTH.unpack_from(data, offset)
+        offset += BATCH_LENGTH_SIZE
+        yield data[offset:offset + size]
+        offset += size
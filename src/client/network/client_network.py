@@ -18,11 +18,13 @@ from common.config import (
     MSG_TYPE_KOTH_STATE,
     MSG_TYPE_CTF_STATE,
     MSG_TYPE_MODE_SELECTED,
+    MSG_TYPE_BATCH,
     GAME_MODE_KOTH,
     GAME_MODE_SURVIVAL,
     GAME_MODE_CTF,
 )
 from common.logger import get_logger
+from client.network.batch import iter_batch
 
 logger = get_logger(__name__)
 
@@ -81,7 +83,8 @@ class ClientNetwork:
         Handles connection errors gracefully and maintains connection state.
         """
         try:
-            async with websockets.connect(self.uri) as ws:
+            # Packed binary state does not compress; skip permessage-deflate
+            async with websockets.connect(self.uri, compression=None) as ws:
                 self._ws = ws
                 self._connected = True
                 logger.info("Connected to server: %s", self.uri)
@@ -110,6 +113,13 @@ class ClientNetwork:
             return
         
         msg_type = data[0]
+        
+        if msg_type == MSG_TYPE_BATCH:
+            # Length-prefixed complete messages; dispatch each in order
+            for message in iter_batch(data):
+                await self._handle_message(message)
+            return
+        
         payload = data[1:]
         
         if msg_type == MSG_TYPE_ENTITIES:
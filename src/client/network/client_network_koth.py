@@ -17,8 +17,10 @@ from common.config import (
     MSG_TYPE_BULLETS,
     MSG_TYPE_CLIENT_READY,
     MSG_TYPE_START_GAME,
+    MSG_TYPE_BATCH,
 )
 from common.logger import get_logger
+from client.network.batch import iter_batch
 
 from koth_config import MSG_TYPE_KOTH_STATE
 
@@ -95,6 +97,13 @@ class ClientNetworkKOTH:
             return
         
         msg_type = data[0]
+        
+        if msg_type == MSG_TYPE_BATCH:
+            # Length-prefixed complete messages; dispatch each in order
+            for message in iter_batch(data):
+                await self._handle_message(message)
+            return
+        
         payload = data[1:]
         
         if msg_type == MSG_TYPE_ENTITIES:
@@ -88,7 +88,9 @@ WALL_CHANGE_PACKED_SIZE = 5  # 1+2+2
 # Ammo sentinel value: if ammo equals this, treat as infinite on client UI.
 AMMO_INFINITE = 65535
 
-# Message types
+# Message types. Every message is sent as a binary websocket frame whose
+# first byte is the type; text frames are never used, so the websocket
+# layer never runs UTF-8 validation on this protocol.
 MSG_TYPE_ENTITIES = 0x02
 MSG_TYPE_WALLS = 0x03
 MSG_TYPE_BULLETS = 0x04
@@ -108,4 +110,10 @@ GAME_MODE_KOTH = 0x02
 GAME_MODE_CTF = 0x03
 
 # CTF-specific message type
-MSG_TYPE_CTF_STATE = 0x13
\ No newline at end of file
+MSG_TYPE_CTF_STATE = 0x13
+
+# Per-tick batch: several complete messages in one frame, each preceded
+# by its byte length (type byte included) as a little-endian uint32
+MSG_TYPE_BATCH = 0x14
+BATCH_LENGTH_FORMAT = "<I"
+BATCH_LENGTH_SIZE = 4
\ No newline at end of file
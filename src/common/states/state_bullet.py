@@ -9,6 +9,11 @@ from common.config import (
 )
 
 
+# Precompiled wire formats (see StateBullet.pack for the field layout)
+_COUNT_STRUCT = struct.Struct("!H")
+_BULLET_STRUCT = struct.Struct("!HfffHB")
+
+
 class StateBullet:
     """
     Pure bullet state for network transmission.
@@ -17,6 +22,8 @@ class StateBullet:
     is handled server-side.
     """
 
+    __slots__ = ("id_bullet", "x", "y", "radius", "owner_id", "team")
+
     def __init__(
         self,
         id_bullet: int,
@@ -69,8 +76,7 @@ class StateBullet:
         Returns:
             Packed binary data (17 bytes).
         """
-        return struct.pack(
-            "!HfffHB",
+        return _BULLET_STRUCT.pack(
             self.id_bullet,
             self.x,
             self.y,
@@ -79,6 +85,19 @@ class StateBullet:
             self.team,
         )
 
+    @staticmethod
+    def packed_bullets_size(num_bullets: int) -> int:
+        """
+        Compute the packed size of a bullet list.
+
+        Args:
+            num_bullets: Number of bullets in the list.
+
+        Returns:
+            Size in bytes, including the count header.
+        """
+        return _COUNT_STRUCT.size + num_bullets * BULLET_PACKED_SIZE
+
     @staticmethod
     def pack_bullets(bullets: list["StateBullet"]) -> bytes:
         """
@@ -90,6 +109,32 @@ class StateBullet:
         Returns:
             Packed binary data with bullet count header.
 
+        Raises:
+            ValueError: If too many bullets to fit in packet.
+        """
+        data = bytearray(StateBullet.packed_bullets_size(len(bullets)))
+        StateBullet.pack_bullets_into(bullets, data)
+        return bytes(data)
+
+    @staticmethod
+    def pack_bullets_into(
+        bullets: list["StateBullet"], out: bytearray, offset: int = 0
+    ) -> int:
+        """
+        Serialize multiple bullets straight into a caller-owned buffer.
+
+        Same layout as pack_bullets(), without the intermediate bytes
+        object. The buffer must have room for packed_bullets_size() bytes
+        from offset.
+
+        Args:
+            bullets: List of StateBullet objects to pack.
+            out: Buffer to write into.
+            offset: Position of the count header in out.
+
+        Returns:
+            Offset just past the last packed record.
+
         Raises:
             ValueError: If too many bullets to fit in packet.
         """
@@ -100,13 +145,24 @@ class StateBullet:
                 f"(max {MAX_BULLETS_COUNT})"
             )
 
-        data = bytearray()
-        data.extend(struct.pack("!H", num_bullets))
+        _COUNT_STRUCT.pack_into(out, offset, num_bullets)
 
+        pack_into = _BULLET_STRUCT.pack_into
+        offset += _COUNT_STRUCT.size
         for bullet in bullets:
-            data.extend(bullet.pack())
+            pack_into(
+                out,
+                offset,
+                bullet.id_bullet,
+                bullet.x,
+                bullet.y,
+                bullet.radius,
+                bullet.owner_id,
+                bullet.team,
+            )
+            offset += BULLET_PACKED_SIZE
 
-        return bytes(data)
+        return offset
 
     @staticmethod
     def unpack_bullets(data: bytes) -> list["StateBullet"]:
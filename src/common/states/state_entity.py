@@ -13,6 +13,11 @@ from common.config import (
 )
 
 
+# Precompiled wire formats (see StateEntity.pack for the field layout)
+_COUNT_STRUCT = struct.Struct("!H")
+_ENTITY_STRUCT = struct.Struct("!HffffBfH")
+
+
 class Team(IntEnum):
     """Team/ownership identifiers for entities."""
 
@@ -96,8 +101,7 @@ class StateEntity:
         Returns:
             Packed binary data (ENTITY_PACKED_SIZE bytes).
         """
-        return struct.pack(
-            "!HffffBfH",
+        return _ENTITY_STRUCT.pack(
             self.id_entity,
             self.x,
             self.y,
@@ -108,6 +112,19 @@ class StateEntity:
             int(self.ammo),
         )
 
+    @staticmethod
+    def packed_entities_size(num_entities: int) -> int:
+        """
+        Compute the packed size of a entity list.
+
+        Args:
+            num_entities: Number of entities in the list.
+
+        Returns:
+            Size in bytes, including the count header.
+        """
+        return _COUNT_STRUCT.size + num_entities * ENTITY_PACKED_SIZE
+
     @staticmethod
     def pack_entities(entities: list["StateEntity"]) -> bytes:
         """
@@ -119,6 +136,32 @@ class StateEntity:
         Returns:
             Packed binary data with entity count header.
 
+        Raises:
+            ValueError: If too many entities to fit in packet.
+        """
+        data = bytearray(StateEntity.packed_entities_size(len(entities)))
+        StateEntity.pack_entities_into(entities, data)
+        return bytes(data)
+
+    @staticmethod
+    def pack_entities_into(
+        entities: list["StateEntity"], out: bytearray, offset: int = 0
+    ) -> int:
+        """
+        Serialize multiple entities straight into a caller-owned buffer.
+
+        Same layout as pack_entities(), without the intermediate bytes
+        object. The buffer must have room for packed_entities_size() bytes
+        from offset.
+
+        Args:
+            entities: List of StateEntity objects to pack.
+            out: Buffer to write into.
+            offset: Position of the count header in out.
+
+        Returns:
+            Offset just past the last packed record.
+
         Raises:
             ValueError: If too many entities to fit in packet.
         """
@@ -129,13 +172,26 @@ class StateEntity:
                 f"(max {MAX_ENTITIES_COUNT})"
             )
 
-        data = bytearray()
-        data.extend(struct.pack("!H", num_entities))
+        _COUNT_STRUCT.pack_into(out, offset, num_entities)
 
+        pack_into = _ENTITY_STRUCT.pack_into
+        offset += _COUNT_STRUCT.size
         for entity in entities:
-            data.extend(entity.pack())
+            pack_into(
+                out,
+                offset,
+                entity.id_entity,
+                entity.x,
+                entity.y,
+                entity.radius,
+                entity.gun_angle,
+                entity.team,
+                float(entity.health),
+                int(entity.ammo),
+            )
+            offset += ENTITY_PACKED_SIZE
 
-        return bytes(data)
+        return offset
 
     @staticmethod
     def unpack_entities(data: bytes) -> list["StateEntity"]:
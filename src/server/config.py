@@ -38,6 +38,9 @@ DEFAULT_RELOAD_DURATION = 1.5  # Reduced from 2.0 for faster reloads
 AGENT_GUN_ROTATION_SPEED = 2.0 * math.pi / 3.0  # Faster gun rotation (was /5.0)
 DETECTION_INTERVAL = 2  # Reduced from 5 for more frequent enemy detection
 
+# Spatial partitioning (broadphase for area queries)
+SPATIAL_GRID_CELL_SIZE = 80.0  # Cell edge in pixels (~2 agent diameters)
+
 # Game setup - SURVIVAL MODE (3 agents per team)
 TEAM_A_SPAWNS = [
     (160.0, 120.0, AggressiveSurvivalStrategy),
@@ -81,6 +84,21 @@ TEAM_B_SPAWNS_CTF = [
 
 REQUIRED_CLIENTS_TO_START = 1  # Changed to 1 so you can test alone
 
+# Networking
+CLIENT_SEND_QUEUE_SIZE = 64  # Pending outgoing messages per client (oldest dropped when full)
+CLIENT_BACKLOG_HIGH_WATER = 4  # Skip state frames for a client with this many unsent messages
+PACK_OFFLOAD_THRESHOLD = 64  # States per tick above which packing runs off the event loop
+BROADCAST_BUFFER_SIZE = 128 * 1024  # Initial size (bytes) of the reusable broadcast buffer
+BROADCAST_REFRESH_INTERVAL = 40  # Resend unchanged entity/bullet state every N broadcasts
+SERVER_BACKLOG = 2048  # Listen backlog for pending TCP connections
+WEBSOCKET_MAX_MESSAGE_SIZE = 1 << 20  # Largest inbound WebSocket message (bytes) accepted
+
+# Game loop pacing
+LOOP_SPIN_THRESHOLD = 0.001  # Below this wait (s), yield with sleep(0) instead of a timed sleep
+LOOP_SLEEP_UNDERSHOOT = 0.0005  # Minimum early wake (s) from timed sleeps before spinning to the tick
+LOOP_MAX_SLEEP_SLACK = 0.010  # Cap (s) on the early wake learned from observed oversleep
+LOOP_MAX_CATCHUP_STEPS = 5  # Max simulation steps run back-to-back when the loop falls behind
+
 
 # ============================================================================
 # CRITICAL PARAMETERS - Game logic constants; do not modify
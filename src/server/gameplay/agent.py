@@ -1,5 +1,6 @@
 # External libraries
 import math
+from typing import Callable
 
 
 # Internal libraries
@@ -31,6 +32,7 @@ from server.gameplay.collision import (
     CollisionType,
     check_move_validity,
 )
+from server.gameplay.spatial_grid import SpatialGrid
 from server.strategy.base import Strategy
 
 
@@ -90,6 +92,8 @@ class Agent:
         shoot_duration: float = DEFAULT_SHOOT_DURATION,
         gun_angle: float | None = None,
         ammo: int | None = None,
+        on_death: Callable[[int], None] | None = None,
+        spatial_grid: SpatialGrid | None = None,
     ) -> None:
         """
         Initialize agent with auto-generated ID.
@@ -108,6 +112,10 @@ class Agent:
             shoot_duration: Cooldown between shots in seconds.
             gun_angle: Initial gun angle in radians. If None, set based
                 on starting X position.
+            on_death: Optional callback invoked with the agent ID when
+                damage first drops health to zero.
+            spatial_grid: Optional grid kept in sync with agent positions,
+                used to find agents near the FOV without scanning them all.
         """
         # Auto-set gun angle based on position
         if gun_angle is None:
@@ -134,6 +142,8 @@ class Agent:
         self.agents_dict = agents_dict
         self.bullets_dict = bullets_dict
         self.strategy = strategy
+        self.on_death = on_death
+        self.spatial_grid = spatial_grid
         self.detected_enemies: set[int] = set()
 
         self.health = health
@@ -394,11 +404,8 @@ class Agent:
         current = self.state.gun_angle
         delta = self.target_gun_angle - current
 
-        # Normalize delta to [-pi, pi]
-        while delta > math.pi:
-            delta -= 2 * math.pi
-        while delta < -math.pi:
-            delta += 2 * math.pi
+        # Normalize delta to [-pi, pi) in one step, however far apart
+        delta = (delta + math.pi) % (2 * math.pi) - math.pi
 
         max_rotation = self.gun_rotation_speed * dt
         new_angle = current + math.copysign(
@@ -500,10 +507,17 @@ class Agent:
         detected: set[int] = set()
         angle_step = FOV_OPENING / FOV_NUM_RAYS
 
+        # Agents in reach are the same for every ray, so gather them once.
+        # Without an enemy in reach no ray can detect anything.
+        candidates = self._fov_candidates(fov_radius)
+        if not any(agent.state.team != self.state.team for _, agent in candidates):
+            self.detected_enemies = detected
+            return detected
+
         for i in range(FOV_NUM_RAYS + 1):
             angle = start_angle + i * angle_step
             hit = self._cast_ray(
-                self.state.x, self.state.y, angle, fov_radius
+                self.state.x, self.state.y, angle, fov_radius, candidates
             )
 
             if hit and hit[1] == "agent":
@@ -518,8 +532,54 @@ class Agent:
         self.detected_enemies = detected
         return detected
 
+    def _fov_candidates(self, fov_radius: float) -> list[tuple[int, "Agent"]]:
+        """
+        Collect other agents close enough to be hit by an FOV ray.
+
+        Uses the spatial grid when one is attached, otherwise scans all
+        agents.
+
+        Args:
+            fov_radius: FOV ray length in pixels.
+
+        Returns:
+            List of (agent_id, agent) pairs within reach.
+        """
+        x = self.state.x
+        y = self.state.y
+
+        if self.spatial_grid is not None:
+            # Pad by the largest body in the grid, matching the per-agent
+            # radius test below
+            reach = fov_radius + self.spatial_grid.max_radius
+            nearby = self.spatial_grid.query_rect(
+                x - reach, y - reach, x + reach, y + reach
+            )
+        else:
+            nearby = self.agents_dict.values()
+
+        candidates: list[tuple[int, "Agent"]] = []
+        for agent in nearby:
+            agent_id = agent.state.id_entity
+            if agent_id == self.state.id_entity:
+                continue
+
+            dx_agent = agent.state.x - x
+            dy_agent = agent.state.y - y
+            dist_sq = dx_agent * dx_agent + dy_agent * dy_agent
+
+            if dist_sq < (fov_radius + agent.state.radius) ** 2:
+                candidates.append((agent_id, agent))
+
+        return candidates
+
     def _cast_ray(
-        self, start_x: float, start_y: float, angle: float, max_distance: float
+        self,
+        start_x: float,
+        start_y: float,
+        angle: float,
+        max_distance: float,
+        candidates: list[tuple[int, "Agent"]],
     ) -> tuple[float, str, int] | None:
         """
         Cast ray and return first obstacle hit.
@@ -532,6 +592,7 @@ class Agent:
             start_y: Ray origin Y.
             angle: Ray direction angle in radians.
             max_distance: Maximum ray distance.
+            candidates: Agents within reach, from _fov_candidates().
 
         Returns:
             Tuple of (distance, hit_type, hit_id) or None.
@@ -545,20 +606,6 @@ class Agent:
         current_y = start_y
         traveled = 0.0
 
-        fov_radius = FOV_RATIO * self.state.radius
-        candidates: list[tuple[int, "Agent"]] = []
-
-        for agent_id, agent in self.agents_dict.items():
-            if agent_id == self.state.id_entity:
-                continue
-
-            dx_agent = agent.state.x - start_x
-            dy_agent = agent.state.y - start_y
-            dist_sq = dx_agent * dx_agent + dy_agent * dy_agent
-
-            if dist_sq < (fov_radius + agent.state.radius) ** 2:
-                candidates.append((agent_id, agent))
-
         while traveled < max_distance:
             current_x += dx * step_size
             current_y += dy * step_size
@@ -584,9 +631,13 @@ class Agent:
             target_id: Agent ID to check.
 
         Returns:
-            True if agent is in detected_enemies, False otherwise.
+            True if agent is in detected_enemies and still in the game,
+            False otherwise.
         """
-        return target_id in self.detected_enemies
+        return (
+            target_id in self.detected_enemies
+            and target_id in self.agents_dict
+        )
 
     def get_closest_enemy(self) -> int | None:
         """
@@ -598,23 +649,26 @@ class Agent:
         if not self.detected_enemies:
             return None
 
-        # Filter out dead agents
-        alive_enemies = [
-            aid
-            for aid in self.detected_enemies
-            if aid in self.agents_dict and self.agents_dict[aid].is_alive()
-        ]
+        # Single pass over the detected set, skipping removed or dead agents
+        agents_dict = self.agents_dict
+        x = self.state.x
+        y = self.state.y
+        closest_id = None
+        closest_dist_sq = math.inf
 
-        if not alive_enemies:
-            return None
+        for aid in self.detected_enemies:
+            enemy = agents_dict.get(aid)
+            if enemy is None or not enemy.is_alive():
+                continue
 
-        return min(
-            alive_enemies,
-            key=lambda aid: (
-                self.agents_dict[aid].state.x - self.state.x
-            ) ** 2
-            + (self.agents_dict[aid].state.y - self.state.y) ** 2,
-        )
+            dx = enemy.state.x - x
+            dy = enemy.state.y - y
+            dist_sq = dx * dx + dy * dy
+            if dist_sq < closest_dist_sq:
+                closest_dist_sq = dist_sq
+                closest_id = aid
+
+        return closest_id
 
     # Health and alive state
 
@@ -625,6 +679,7 @@ class Agent:
         Args:
             amount: Damage amount to apply.
         """
+        was_alive = self.health > 0
         self.health = max(0.0, self.health - amount)
         # Mirror to network-visible state so clients see updated health
         try:
@@ -632,6 +687,9 @@ class Agent:
         except Exception:
             pass
 
+        if was_alive and self.health <= 0 and self.on_death is not None:
+            self.on_death(self.state.id_entity)
+
     def is_alive(self) -> bool:
         """
         Check if agent is still alive.
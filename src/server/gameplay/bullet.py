@@ -15,6 +15,10 @@ class Bullet:
     network transmission.
     """
 
+    # Fixed attribute layout: bullets are created and dropped every tick,
+    # so skip the per-instance __dict__ allocation
+    __slots__ = ("state", "vx", "vy", "damage", "lifetime", "age")
+
     # Class-level ID counter with wraparound
     _next_id = 0
 
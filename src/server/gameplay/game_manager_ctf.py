@@ -14,7 +14,13 @@ from common.states.state_walls import StateWalls
 from server.gameplay.agent import Agent
 from server.gameplay.bullet import Bullet
 from server.gameplay.collision import find_bullet_agent_collisions, find_bullet_wall_collisions
-from server.config import DETECTION_INTERVAL
+from server.gameplay.spatial_grid import SpatialGrid
+from server.config import (
+    DETECTION_INTERVAL,
+    SPATIAL_GRID_CELL_SIZE,
+    TEAM_A_SPAWNS_CTF,
+    TEAM_B_SPAWNS_CTF,
+)
 from common.logger import get_logger
 
 # Import CTF configuration
@@ -163,6 +169,25 @@ class GameManagerCTF:
         self.tick_count = 0
         self.is_running = False
         
+        # Alive agents per team, kept in sync on spawn/death so strategies
+        # can answer "am I the last one alive?" without scanning all agents
+        self.team_alive_count: dict[Team, int] = {Team.TEAM_A: 0, Team.TEAM_B: 0}
+        
+        # Broadphase for FOV ray casting: agents only test rays against
+        # agents in cells near them
+        self._agent_grid = SpatialGrid(
+            SPATIAL_GRID_CELL_SIZE, LOGICAL_SCREEN_WIDTH, LOGICAL_SCREEN_HEIGHT
+        )
+        
+        # Enemy detections computed this tick, keyed by agent ID, so the
+        # strategies and the periodic pass share one FOV scan per agent
+        self._detection_frame = -1
+        self._detections: dict[int, set[int]] = {}
+        
+        # Agent of each team carrying the enemy flag, resolved once per tick
+        # so strategies don't each look the carriers up by ID
+        self.flag_carriers: dict[Team, Optional[Agent]] = {Team.TEAM_A: None, Team.TEAM_B: None}
+        
         # CTF-specific state
         self.flag_team_a = CTFFlag(Team.TEAM_A, CTF_FLAG_TEAM_A_BASE_X, CTF_FLAG_TEAM_A_BASE_Y)
         self.flag_team_b = CTFFlag(Team.TEAM_B, CTF_FLAG_TEAM_B_BASE_X, CTF_FLAG_TEAM_B_BASE_Y)
@@ -261,6 +286,21 @@ class GameManagerCTF:
         
         if self.flag_team_b.update_drop_timer(dt):
             self.flag_team_b.reset_to_base()
+        
+        # Flag state is final for this tick: resolve carriers for the next
+        # tick's role decisions
+        self._resolve_flag_carriers()
+    
+    def _resolve_flag_carriers(self) -> None:
+        """Record which agent of each team is carrying the enemy flag."""
+        for flag, carrier_team in (
+            (self.flag_team_b, Team.TEAM_A),
+            (self.flag_team_a, Team.TEAM_B),
+        ):
+            carrier = None
+            if flag.state == FlagState.CARRIED and flag.carrier_id is not None:
+                carrier = self.agents.get(flag.carrier_id)
+            self.flag_carriers[carrier_team] = carrier
     
     def _capture_flag(self, team: int, flag: CTFFlag) -> None:
         """
@@ -299,6 +339,58 @@ class GameManagerCTF:
         if enemy_flag.carrier_id == agent_id:
             enemy_flag.drop(agent_x, agent_y)
     
+    # Agent management
+    
+    def _add_agent(self, agent: Agent) -> None:
+        """
+        Register a spawned agent, count it as alive and add it to the grid.
+        
+        Args:
+            agent: Newly created agent.
+        """
+        self.agents[agent.state.id_entity] = agent
+        self.team_alive_count[agent.state.team] += 1
+        self._agent_grid.insert(agent)
+    
+    def _notify_dead(self, agent_id: int) -> None:
+        """
+        Decrement the alive count of a team when one of its agents dies.
+        
+        Args:
+            agent_id: ID of the agent whose health reached zero.
+        """
+        agent = self.agents.get(agent_id)
+        if agent is not None:
+            self.team_alive_count[agent.state.team] -= 1
+    
+    def detect_enemies(self, agent: Agent) -> set[int]:
+        """
+        Run an agent's FOV scan at most once per tick.
+        
+        Scans are staggered: each agent rescans once every
+        DETECTION_INTERVAL ticks, with phases spread by agent ID, and
+        reuses its last result in between.
+        
+        Args:
+            agent: Agent whose visible enemies are requested.
+        
+        Returns:
+            Set of detected enemy agent IDs (also stored on the agent).
+        """
+        if self._detection_frame != self.tick_count:
+            self._detection_frame = self.tick_count
+            self._detections.clear()
+        
+        agent_id = agent.state.id_entity
+        detected = self._detections.get(agent_id)
+        if detected is None:
+            if (self.tick_count + agent_id) % DETECTION_INTERVAL == 0:
+                detected = agent.detect_enemies()
+            else:
+                detected = agent.detected_enemies
+            self._detections[agent_id] = detected
+        return detected
+    
     # Win conditions
     
     def check_win_condition(self) -> Optional[int]:
@@ -340,8 +432,6 @@ class GameManagerCTF:
     
     def spawn_test_agents(self) -> None:
         """Spawn agents for both teams using CTF-specific spawn points."""
-        from server.config import TEAM_A_SPAWNS_CTF, TEAM_B_SPAWNS_CTF
-        
         logger.info("=" * 60)
         logger.info("🚀 STARTING CTF AGENT SPAWN")
         logger.info(f"Team A spawn points: {len(TEAM_A_SPAWNS_CTF)}")
@@ -359,8 +449,10 @@ class GameManagerCTF:
                 x=x,
                 y=y,
                 team=Team.TEAM_A,
+                on_death=self._notify_dead,
+                spatial_grid=self._agent_grid,
             )
-            self.agents[agent.state.id_entity] = agent
+            self._add_agent(agent)
             team_a_count += 1
             logger.info(f"✅ Spawned Team A agent #{agent.state.id_entity} at ({x}, {y})")
         
@@ -375,8 +467,10 @@ class GameManagerCTF:
                 x=x,
                 y=y,
                 team=Team.TEAM_B,
+                on_death=self._notify_dead,
+                spatial_grid=self._agent_grid,
             )
-            self.agents[agent.state.id_entity] = agent
+            self._add_agent(agent)
             team_b_count += 1
             logger.info(f"✅ Spawned Team B agent #{agent.state.id_entity} at ({x}, {y})")
         
@@ -417,11 +511,12 @@ class GameManagerCTF:
         # Update agents
         for agent in self.agents.values():
             agent.update_strategy(dt)
+            self._agent_grid.update(agent)
         
         # Periodic enemy detection
         if self.tick_count % DETECTION_INTERVAL == 0:
             for agent in self.agents.values():
-                agent.detect_enemies()
+                self.detect_enemies(agent)
         
         # Check bullet-agent collisions
         bullet_hits = find_bullet_agent_collisions(self.bullets, self.agents)
@@ -455,6 +550,7 @@ class GameManagerCTF:
             for other_agent in self.agents.values():
                 other_agent.detected_enemies.discard(aid)
             
+            self._agent_grid.remove(agent)
             del self.agents[aid]
         
         # CTF-specific updates
@@ -4,7 +4,6 @@ KOTH Game Manager - DEBUG VERSION with extensive logging.
 This version adds comprehensive logging to help identify why scoring doesn't work.
 """
 
-import math
 from typing import Optional
 
 from common.config import LOGICAL_SCREEN_WIDTH, LOGICAL_SCREEN_HEIGHT, GRID_UNIT
@@ -13,7 +12,13 @@ from common.states.state_walls import StateWalls
 from server.gameplay.agent import Agent
 from server.gameplay.bullet import Bullet
 from server.gameplay.collision import find_bullet_agent_collisions, find_bullet_wall_collisions
-from server.config import DETECTION_INTERVAL, TEAM_A_SPAWNS_KOTH, TEAM_B_SPAWNS_KOTH
+from server.gameplay.spatial_grid import SpatialGrid
+from server.config import (
+    DETECTION_INTERVAL,
+    SPATIAL_GRID_CELL_SIZE,
+    TEAM_A_SPAWNS_KOTH,
+    TEAM_B_SPAWNS_KOTH,
+)
 
 # Import KOTH configuration
 from common.koth_config import (
@@ -27,7 +32,6 @@ from common.koth_config import (
     KOTH_ZONE_SHAPE,
     KOTH_POINTS_PER_SECOND,
     KOTH_SCORING_INTERVAL,
-    KOTH_CONTESTED_BLOCKS_SCORING,
     KOTH_MAX_POINTS,
     KOTH_MAX_DURATION,
 )
@@ -36,6 +40,16 @@ from common.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Points awarded for one full scoring interval of zone control
+_POINTS_PER_INTERVAL = KOTH_POINTS_PER_SECOND * KOTH_SCORING_INTERVAL
+
+# Zone shape constants, resolved once instead of per agent check
+_ZONE_RADIUS_SQ = KOTH_ZONE_RADIUS * KOTH_ZONE_RADIUS
+_RECT_X0 = KOTH_ZONE_RECT_X
+_RECT_X1 = KOTH_ZONE_RECT_X + KOTH_ZONE_RECT_WIDTH
+_RECT_Y0 = KOTH_ZONE_RECT_Y
+_RECT_Y1 = KOTH_ZONE_RECT_Y + KOTH_ZONE_RECT_HEIGHT
+
 
 class GameManagerKOTH:
     """
@@ -67,6 +81,27 @@ class GameManagerKOTH:
         self.agents: dict[int, Agent] = {}
         self.bullets: dict[int, Bullet] = {}
         self.tick_count = 0
+        
+        # Alive agents as a flat list (kept in sync on spawn/death) so the
+        # per-tick loops avoid dict iteration and dead-agent checks
+        self._alive_agents: list[Agent] = []
+        # IDs of agents killed since the last dead-agent sweep
+        self._pending_deaths: list[int] = []
+        
+        # Broadphase for zone membership and FOV ray casting: only agents
+        # in cells overlapping the queried bounds get the precise test
+        self._zone_grid = SpatialGrid(
+            SPATIAL_GRID_CELL_SIZE, LOGICAL_SCREEN_WIDTH, LOGICAL_SCREEN_HEIGHT
+        )
+        if KOTH_ZONE_SHAPE == "circle":
+            self._zone_bounds = (
+                KOTH_ZONE_CENTER_X - KOTH_ZONE_RADIUS,
+                KOTH_ZONE_CENTER_Y - KOTH_ZONE_RADIUS,
+                KOTH_ZONE_CENTER_X + KOTH_ZONE_RADIUS,
+                KOTH_ZONE_CENTER_Y + KOTH_ZONE_RADIUS,
+            )
+        else:
+            self._zone_bounds = (_RECT_X0, _RECT_Y0, _RECT_X1, _RECT_Y1)
         self.is_running = False
         
         # KOTH-specific state
@@ -99,26 +134,28 @@ class GameManagerKOTH:
         Returns:
             True if agent is in zone, False otherwise.
         """
+        state = agent.state
+        x = state.x
+        y = state.y
+        
         if KOTH_ZONE_SHAPE == "circle":
-            dx = agent.state.x - KOTH_ZONE_CENTER_X
-            dy = agent.state.y - KOTH_ZONE_CENTER_Y
+            dx = x - KOTH_ZONE_CENTER_X
+            dy = y - KOTH_ZONE_CENTER_Y
             distance_sq = dx * dx + dy * dy
-            in_zone = distance_sq <= KOTH_ZONE_RADIUS * KOTH_ZONE_RADIUS
+            in_zone = distance_sq <= _ZONE_RADIUS_SQ
             
             # Debug logging every 100 checks
             if self.debug_zone_checks % 100 == 0:
-                distance = math.sqrt(distance_sq)
-                logger.debug(f"Agent {agent.state.id_entity} at ({agent.state.x:.1f}, {agent.state.y:.1f}), distance={distance:.1f}, in_zone={in_zone}")
+                logger.debug(
+                    "Agent %d at (%.1f, %.1f), distance_sq=%.1f, in_zone=%s",
+                    state.id_entity, x, y, distance_sq, in_zone,
+                )
             self.debug_zone_checks += 1
             
             return in_zone
         
         elif KOTH_ZONE_SHAPE == "rectangle":
-            in_zone = (
-                KOTH_ZONE_RECT_X <= agent.state.x <= KOTH_ZONE_RECT_X + KOTH_ZONE_RECT_WIDTH
-                and KOTH_ZONE_RECT_Y <= agent.state.y <= KOTH_ZONE_RECT_Y + KOTH_ZONE_RECT_HEIGHT
-            )
-            return in_zone
+            return _RECT_X0 <= x <= _RECT_X1 and _RECT_Y0 <= y <= _RECT_Y1
         
         return False
     
@@ -130,25 +167,28 @@ class GameManagerKOTH:
         
         Updates koth_state.zone_status based on which teams have agents in zone.
         """
-        team_a_count = 0
-        team_b_count = 0
-        
-        team_a_agents = []
-        team_b_agents = []
+        # In-zone agent IDs bucketed by Team value (slot 0 collects neutral
+        # agents), so counting needs no per-agent team comparison
+        zone_members: list[list[int]] = [[] for _ in Team]
         
         logger.debug(f"[Tick {self.tick_count}] Checking zone control, total agents={len(self.agents)}")
         
-        for agent in self.agents.values():
-            if not agent.is_alive():
-                continue
-            
+        team_a_agents = zone_members[Team.TEAM_A]
+        team_b_agents = zone_members[Team.TEAM_B]
+        
+        # Grid only holds alive agents, so no is_alive() check is needed.
+        # Once both teams are present the zone is contested whatever the
+        # remaining agents are, so the scan stops early (logged counts are
+        # then lower bounds).
+        for agent in self._zone_grid.query_rect(*self._zone_bounds):
             if self.is_agent_in_zone(agent):
-                if agent.state.team == Team.TEAM_A:
-                    team_a_count += 1
-                    team_a_agents.append(agent.state.id_entity)
-                elif agent.state.team == Team.TEAM_B:
-                    team_b_count += 1
-                    team_b_agents.append(agent.state.id_entity)
+                state = agent.state
+                zone_members[state.team].append(state.id_entity)
+                if team_a_agents and team_b_agents:
+                    break
+        
+        team_a_count = len(team_a_agents)
+        team_b_count = len(team_b_agents)
         
         # Determine zone status
         old_status = self.koth_state.zone_status
@@ -169,7 +209,7 @@ class GameManagerKOTH:
     
     # Scoring
     
-    def update_scoring(self, dt: float) -> None:
+    def update_scoring(self, dt: float) -> bool:
         """
         Update team scores based on zone control - FIXED VERSION.
         
@@ -177,6 +217,9 @@ class GameManagerKOTH:
         
         Args:
             dt: Delta time in seconds.
+        
+        Returns:
+            True if any points were awarded this call, False otherwise.
         """
         self.scoring_timer += dt
         
@@ -184,27 +227,33 @@ class GameManagerKOTH:
         if self.tick_count % 60 == 0:
             logger.info(f"[Tick {self.tick_count}] Scoring timer: {self.scoring_timer:.3f}s, Team A: {self.koth_state.team_a_score:.1f}, Team B: {self.koth_state.team_b_score:.1f}")
         
-        while self.scoring_timer >= KOTH_SCORING_INTERVAL:
-            self.scoring_timer -= KOTH_SCORING_INTERVAL
-            self.debug_scoring_attempts += 1
-            
-            # Award points based on zone control
-            if self.koth_state.zone_status == KOTHZoneStatus.TEAM_A:
-                points = KOTH_POINTS_PER_SECOND * KOTH_SCORING_INTERVAL
-                self.koth_state.team_a_score += points
-                logger.info(f"[Tick {self.tick_count}] ✅ TEAM A SCORED {points:.1f} points! Total: {self.koth_state.team_a_score:.1f}")
-            
-            elif self.koth_state.zone_status == KOTHZoneStatus.TEAM_B:
-                points = KOTH_POINTS_PER_SECOND * KOTH_SCORING_INTERVAL
-                self.koth_state.team_b_score += points
-                logger.info(f"[Tick {self.tick_count}] ✅ TEAM B SCORED {points:.1f} points! Total: {self.koth_state.team_b_score:.1f}")
-            
-            elif self.koth_state.zone_status == KOTHZoneStatus.CONTESTED:
-                logger.debug(f"[Tick {self.tick_count}] Zone CONTESTED - no points awarded")
-                if not KOTH_CONTESTED_BLOCKS_SCORING:
-                    pass
-            else:
-                logger.debug(f"[Tick {self.tick_count}] Zone NEUTRAL - no points awarded")
+        # Award all elapsed intervals at once; zone status is fixed for this tick
+        intervals = int(self.scoring_timer // KOTH_SCORING_INTERVAL)
+        if intervals <= 0:
+            return False
+        
+        self.scoring_timer -= intervals * KOTH_SCORING_INTERVAL
+        self.debug_scoring_attempts += intervals
+        
+        # Award points based on zone control
+        if self.koth_state.zone_status == KOTHZoneStatus.TEAM_A:
+            points = intervals * _POINTS_PER_INTERVAL
+            self.koth_state.team_a_score += points
+            logger.info(f"[Tick {self.tick_count}] ✅ TEAM A SCORED {points:.1f} points! Total: {self.koth_state.team_a_score:.1f}")
+            return True
+        
+        elif self.koth_state.zone_status == KOTHZoneStatus.TEAM_B:
+            points = intervals * _POINTS_PER_INTERVAL
+            self.koth_state.team_b_score += points
+            logger.info(f"[Tick {self.tick_count}] ✅ TEAM B SCORED {points:.1f} points! Total: {self.koth_state.team_b_score:.1f}")
+            return True
+        
+        elif self.koth_state.zone_status == KOTHZoneStatus.CONTESTED:
+            logger.debug(f"[Tick {self.tick_count}] Zone CONTESTED - no points awarded")
+        else:
+            logger.debug(f"[Tick {self.tick_count}] Zone NEUTRAL - no points awarded")
+        
+        return False
     
     # Win conditions
     
@@ -239,6 +288,39 @@ class GameManagerKOTH:
         
         return None
     
+    # Agent management
+    
+    def _add_agent(self, agent: Agent) -> None:
+        """
+        Register a spawned agent in the agent dict, alive list and zone grid.
+        
+        Args:
+            agent: Newly created agent.
+        """
+        self.agents[agent.state.id_entity] = agent
+        self._alive_agents.append(agent)
+        self._zone_grid.insert(agent)
+    
+    def _notify_dead(self, agent_id: int) -> None:
+        """
+        Queue an agent for removal at the next dead-agent sweep.
+        
+        Args:
+            agent_id: ID of the agent whose health reached zero.
+        """
+        self._pending_deaths.append(agent_id)
+    
+    def _remove_agent(self, agent_id: int) -> None:
+        """
+        Remove a dead agent from the agent dict, alive list and zone grid.
+        
+        Args:
+            agent_id: ID of the agent to remove.
+        """
+        agent = self.agents.pop(agent_id)
+        self._alive_agents.remove(agent)
+        self._zone_grid.remove(agent)
+    
     # Game loop
     
     def spawn_test_agents(self) -> None:
@@ -256,8 +338,10 @@ class GameManagerKOTH:
                 x=x,
                 y=y,
                 team=Team.TEAM_A,
+                on_death=self._notify_dead,
+                spatial_grid=self._zone_grid,
             )
-            self.agents[agent.state.id_entity] = agent
+            self._add_agent(agent)
             team_a_count += 1
         
         # Spawn Team B with KOTH strategy
@@ -271,8 +355,10 @@ class GameManagerKOTH:
                 x=x,
                 y=y,
                 team=Team.TEAM_B,
+                on_death=self._notify_dead,
+                spatial_grid=self._zone_grid,
             )
-            self.agents[agent.state.id_entity] = agent
+            self._add_agent(agent)
             team_b_count += 1
         
         logger.info(f"✅ Spawned {team_a_count} Team A agents and {team_b_count} Team B agents")
@@ -299,64 +385,61 @@ class GameManagerKOTH:
         else:
             logger.warning(f"[Tick {self.tick_count}] Game is OVER! time_elapsed not updating.")
         
-        # Update bullets
-        for bullet in self.bullets.values():
+        # Update bullets and collect expired ones in the same pass
+        expired_bullets = []
+        for bid, bullet in self.bullets.items():
             bullet.update(dt)
-        
-        # Clean up expired bullets
-        expired_bullets = [
-            bid for bid, bullet in self.bullets.items()
-            if not bullet.is_alive()
-        ]
+            if not bullet.is_alive():
+                expired_bullets.append(bid)
         for bid in expired_bullets:
             del self.bullets[bid]
         
         # Update agents
-        for agent in self.agents.values():
+        for agent in self._alive_agents:
             agent.update_strategy(dt)
+            self._zone_grid.update(agent)
         
         # Periodic enemy detection
         if self.tick_count % DETECTION_INTERVAL == 0:
-            for agent in self.agents.values():
+            for agent in self._alive_agents:
                 agent.detect_enemies()
         
         # Check bullet-agent collisions
         bullet_hits = find_bullet_agent_collisions(self.bullets, self.agents)
         for bullet_id, hit_agents in bullet_hits.items():
-            if not hit_agents or bullet_id not in self.bullets:
+            if not hit_agents:
                 continue
             
-            bullet = self.bullets[bullet_id]
+            bullet = self.bullets.pop(bullet_id)
             for agent_id in hit_agents:
                 if agent_id in self.agents:
                     self.agents[agent_id].take_damage(bullet.damage)
-            
-            del self.bullets[bullet_id]
         
         # Check bullet-wall collisions
         destroyed_bullets = find_bullet_wall_collisions(self.bullets, self.walls_state)
         for bullet_id in destroyed_bullets:
-            if bullet_id in self.bullets:
-                del self.bullets[bullet_id]
-        
-        # Remove dead agents
-        dead_agents = [
-            aid for aid, agent in self.agents.items()
-            if not agent.is_alive()
-        ]
-        for aid in dead_agents:
+            self.bullets.pop(bullet_id, None)
+        
+        # Remove dead agents. Stale IDs left in other agents'
+        # detected_enemies are filtered against agents_dict on read and
+        # dropped at the next detection pass.
+        for aid in self._pending_deaths:
             logger.info(f"[Tick {self.tick_count}] Agent {aid} died")
-            for other_agent in self.agents.values():
-                other_agent.detected_enemies.discard(aid)
-            del self.agents[aid]
+            self._remove_agent(aid)
+        self._pending_deaths.clear()
         
         # KOTH-specific updates
         if not self.koth_state.game_over:
             self.update_zone_control()
-            self.update_scoring(dt)
+            scored = self.update_scoring(dt)
             
-            # Check win condition
-            winner = self.check_win_condition()
+            # Scores only change when points are awarded, so the win
+            # check is needed only then or once the time limit is hit
+            time_up = (
+                KOTH_MAX_DURATION > 0
+                and self.koth_state.time_elapsed >= KOTH_MAX_DURATION
+            )
+            winner = self.check_win_condition() if scored or time_up else None
             if winner is not None:
                 logger.info(f"🎉 GAME OVER! Winner: {winner}")
                 self.koth_state.game_over = True
@@ -0,0 +1,131 @@
+# External libraries
+import math
+from typing import TYPE_CHECKING, Iterator
+
+if TYPE_CHECKING:
+    from server.gameplay.agent import Agent
+
+
+class SpatialGrid:
+    """
+    Uniform grid that buckets agents by position.
+
+    Used as a broadphase: area queries return only agents whose cell
+    overlaps the queried bounds, and callers run the precise shape test
+    on those candidates.
+    """
+
+    # Initialization
+
+    def __init__(
+        self, cell_size: float, world_width: float, world_height: float
+    ) -> None:
+        """
+        Initialize empty grid covering the world.
+
+        Args:
+            cell_size: Cell edge length in pixels.
+            world_width: World width in pixels.
+            world_height: World height in pixels.
+        """
+        self.cell_size = cell_size
+        self.cols = max(1, math.ceil(world_width / cell_size))
+        self.rows = max(1, math.ceil(world_height / cell_size))
+        self.cells: list[list["Agent"]] = [[] for _ in range(self.cols * self.rows)]
+        # Agent ID -> index of the cell currently holding the agent
+        self._agent_cells: dict[int, int] = {}
+        # Largest radius of any inserted agent, for callers that pad their
+        # query bounds to catch agents whose body reaches into the area
+        self.max_radius = 0.0
+
+    # Internal helpers
+
+    def _to_cell(self, x: float, y: float) -> tuple[int, int]:
+        """
+        Convert pixel position to clamped cell coordinates.
+
+        Args:
+            x: X position in pixels.
+            y: Y position in pixels.
+
+        Returns:
+            Tuple of (column, row) inside the grid.
+        """
+        cx = min(max(int(x // self.cell_size), 0), self.cols - 1)
+        cy = min(max(int(y // self.cell_size), 0), self.rows - 1)
+        return cx, cy
+
+    # Agent management
+
+    def insert(self, agent: "Agent") -> None:
+        """
+        Add agent to the cell under its current position.
+
+        Args:
+            agent: Agent to insert.
+        """
+        cx, cy = self._to_cell(agent.state.x, agent.state.y)
+        index = cy * self.cols + cx
+        self.cells[index].append(agent)
+        self._agent_cells[agent.state.id_entity] = index
+        if agent.state.radius > self.max_radius:
+            self.max_radius = agent.state.radius
+
+    def remove(self, agent: "Agent") -> None:
+        """
+        Remove agent from the grid if present.
+
+        Args:
+            agent: Agent to remove.
+        """
+        index = self._agent_cells.pop(agent.state.id_entity, None)
+        if index is not None:
+            self.cells[index].remove(agent)
+
+    def update(self, agent: "Agent") -> None:
+        """
+        Move agent to a new cell if its position crossed a cell border.
+
+        Args:
+            agent: Agent whose position may have changed.
+        """
+        cx, cy = self._to_cell(agent.state.x, agent.state.y)
+        index = cy * self.cols + cx
+        old_index = self._agent_cells.get(agent.state.id_entity)
+        if old_index == index:
+            return
+
+        if old_index is not None:
+            self.cells[old_index].remove(agent)
+        self.cells[index].append(agent)
+        self._agent_cells[agent.state.id_entity] = index
+
+    # Queries
+
+    def query_rect(
+        self, x_min: float, y_min: float, x_max: float, y_max: float
+    ) -> Iterator["Agent"]:
+        """
+        Iterate agents in cells overlapping an axis-aligned rectangle.
+
+        Results are candidates only; agents near the cell edges may lie
+        outside the rectangle.
+
+        Args:
+            x_min: Rectangle left edge in pixels.
+            y_min: Rectangle bottom edge in pixels.
+            x_max: Rectangle right edge in pixels.
+            y_max: Rectangle top edge in pixels.
+
+        Yields:
+            Agents stored in the overlapping cells.
+        """
+        cx_min, cy_min = self._to_cell(x_min, y_min)
+        cx_max, cy_max = self._to_cell(x_max, y_max)
+        cols = self.cols
+        cells = self.cells
+
+        for cy in range(cy_min, cy_max + 1):
+            row_start = cy * cols
+            for cx in range(cx_min, cx_max + 1):
+                yield from cells[row_start + cx]
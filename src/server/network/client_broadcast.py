@@ -0,0 +1,322 @@
+"""
+Client Broadcast - per-client send queues and batched state frames.
+
+Shared by the single-mode and unified network managers: every client gets
+a bounded send deque drained by its own writer task, and each tick's
+state is assembled into one MSG_TYPE_BATCH frame in a reusable buffer.
+"""
+
+import asyncio
+import struct
+from collections import deque
+from operator import attrgetter
+
+from common.config import (
+    BATCH_LENGTH_FORMAT,
+    BATCH_LENGTH_SIZE,
+    MSG_TYPE_BATCH,
+    MSG_TYPE_BULLETS,
+    MSG_TYPE_ENTITIES,
+    MSG_TYPE_START_GAME,
+)
+from common.states.state_bullet import StateBullet
+from common.states.state_entity import StateEntity
+from server.config import (
+    BROADCAST_BUFFER_SIZE,
+    BROADCAST_REFRESH_INTERVAL,
+    CLIENT_BACKLOG_HIGH_WATER,
+    CLIENT_SEND_QUEUE_SIZE,
+)
+from common.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Precomputed START_GAME message and batch entry length prefix
+START_GAME_MSG = bytes([MSG_TYPE_START_GAME])
+_BATCH_LENGTH = struct.Struct(BATCH_LENGTH_FORMAT)
+
+# Worst-case batch overhead: batch tag plus length and type per message
+_BATCH_OVERHEAD = 1 + 3 * (BATCH_LENGTH_SIZE + 1)
+
+# Pulls .state off agents and bullets without a per-item Python loop
+_get_state = attrgetter("state")
+
+
+def write_batch_entry(buf: bytearray, offset: int, msg_type: int, payload: bytes) -> int:
+    """
+    Write one length-prefixed message into a MSG_TYPE_BATCH frame.
+    
+    Args:
+        buf: Batch buffer, large enough for the entry.
+        offset: Position of the entry's length prefix.
+        msg_type: Message type byte.
+        payload: Message payload, without the type byte.
+    
+    Returns:
+        Offset just past the entry.
+    """
+    start = offset + BATCH_LENGTH_SIZE
+    end = start + 1 + len(payload)
+    _BATCH_LENGTH.pack_into(buf, offset, end - start)
+    buf[start] = msg_type
+    buf[start + 1:end] = payload
+    return end
+
+
+def write_batch_states(
+    buf: bytearray,
+    offset: int,
+    msg_type: int,
+    pack_into,
+    states: list,
+    previous: bytes,
+    refresh: bool,
+) -> tuple[int, bytes]:
+    """
+    Pack a state list in place as one batch entry, unless it is unchanged.
+    
+    Records are packed straight after the type byte, so the payload is
+    never built as a separate object.
+    
+    Args:
+        buf: Batch buffer, large enough for the entry.
+        offset: Position of the entry's length prefix.
+        msg_type: Message type byte.
+        pack_into: StateEntity.pack_entities_into or StateBullet.pack_bullets_into.
+        states: States to pack.
+        previous: Payload last sent for this message type.
+        refresh: Write the entry even if the payload is unchanged.
+    
+    Returns:
+        Offset just past the entry (unchanged if the entry was skipped)
+        and the payload to remember as last sent.
+    """
+    start = offset + BATCH_LENGTH_SIZE
+    end = pack_into(states, buf, start + 1)
+    with memoryview(buf)[start + 1:end] as payload:
+        if not refresh and payload == previous:
+            return offset, previous
+        previous = payload.tobytes()
+    
+    _BATCH_LENGTH.pack_into(buf, offset, end - start)
+    buf[start] = msg_type
+    return end, previous
+
+
+class ClientBroadcastMixin:
+    """
+    Client send queues and batch assembly for a network manager.
+    
+    The host calls _init_broadcast() from __init__, registers connections
+    with _add_client_queue()/_remove_client_queue() and, each broadcast,
+    takes the refresh decision with _take_refresh(), packs the tick with
+    _pack_batch() and queues it with _send_batch(). It must provide a
+    game_manager attribute.
+    
+    Unchanged entity/bullet payloads are left out of a frame. That is only
+    safe while every client has received every frame, so a new client or
+    a dropped state frame makes the next frame carry full state.
+    """
+    
+    def _init_broadcast(self) -> None:
+        """Set up the per-client queues and the broadcast scratch state."""
+        # Per-client bounded send queues drained by one writer task each,
+        # so a slow client never holds up the broadcast to the others.
+        # The writer parks on a wakeup future while its deque is empty.
+        self.client_queues: dict = {}  # ws -> deque of pending messages
+        self.client_wakeups: dict = {}  # ws -> asyncio.Future
+        self.writer_tasks: dict = {}  # ws -> asyncio.Task
+        # (ws, deque) pairs for the broadcast path, rebuilt on connect/disconnect
+        self._client_snapshot: tuple = ()
+        
+        # Reusable scratch buffer the per-tick batch is assembled in
+        self._send_buf = bytearray(BROADCAST_BUFFER_SIZE)
+        
+        # Last packed entity/bullet payloads. Only _pack_batch() touches
+        # them, so packing may run on a worker thread
+        self._prev_entities = b""
+        self._prev_bullets = b""
+        
+        # Event-loop only: broadcast counter for the periodic refresh, and
+        # a request for full state after a client joined or lost a frame
+        self._broadcast_count = 0
+        self._resync_pending = False
+    
+    def _add_client_queue(self, ws) -> None:
+        """
+        Create the send queue and writer task for a new client.
+        
+        Args:
+            ws: WebSocket of the client.
+        """
+        pending: deque = deque(maxlen=CLIENT_SEND_QUEUE_SIZE)
+        self.client_queues[ws] = pending
+        self.writer_tasks[ws] = asyncio.create_task(self._writer(ws, pending))
+        self._refresh_client_snapshot()
+        # Newcomer has no state yet: send everything on the next broadcast
+        self._resync_pending = True
+    
+    def _remove_client_queue(self, ws) -> None:
+        """
+        Drop the send queue of a disconnected client and stop its writer.
+        
+        Args:
+            ws: WebSocket of the client.
+        """
+        self.client_queues.pop(ws, None)
+        self.client_wakeups.pop(ws, None)
+        self._refresh_client_snapshot()
+        writer_task = self.writer_tasks.pop(ws, None)
+        if writer_task:
+            writer_task.cancel()
+    
+    def _refresh_client_snapshot(self) -> None:
+        """Rebuild the cached (ws, deque) pairs used by _send_to_all."""
+        self._client_snapshot = tuple(self.client_queues.items())
+    
+    async def _writer(self, ws, pending: deque) -> None:
+        """
+        Send queued messages to one client until cancelled or disconnected.
+        
+        Args:
+            ws: WebSocket of the client.
+            pending: Outgoing message deque for this client.
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                if not pending:
+                    wakeup = loop.create_future()
+                    self.client_wakeups[ws] = wakeup
+                    await wakeup
+                
+                # Drain everything queued since the last wakeup
+                while pending:
+                    await ws.send(pending.popleft())
+        except asyncio.CancelledError:
+            pass
+        except Exception:
+            logger.debug("Writer stopped for client %s", id(ws), exc_info=True)
+    
+    def _send_to_all(self, msg: bytes, droppable: bool = False) -> None:
+        """
+        Queue message for all connected clients without awaiting delivery.
+        
+        Per-client writer tasks do the actual sends, so this never blocks.
+        
+        Args:
+            msg: Message to send.
+            droppable: True for state frames that a backlogged client may
+                skip, since the next tick supersedes them. Control messages
+                are always queued.
+        """
+        wakeups = self.client_wakeups
+        for ws, pending in self._client_snapshot:
+            # Client not keeping up: let it drain instead of growing backlog
+            if droppable and len(pending) >= CLIENT_BACKLOG_HIGH_WATER:
+                # It misses this frame's changes: resend full state next
+                self._resync_pending = True
+                continue
+            # Bounded deque: a slow client loses its oldest pending message
+            if len(pending) == pending.maxlen:
+                self._resync_pending = True
+            pending.append(msg)
+            wakeup = wakeups.get(ws)
+            if wakeup is not None and not wakeup.done():
+                wakeup.set_result(None)
+    
+    def _collect_states(self) -> tuple[list, list]:
+        """
+        Collect the agent and bullet states of the current tick.
+        
+        Returns:
+            Entity states and bullet states.
+        """
+        game_manager = self.game_manager
+        return (
+            list(map(_get_state, game_manager.agents.values())),
+            list(map(_get_state, game_manager.bullets.values())),
+        )
+    
+    def _take_refresh(self) -> bool:
+        """
+        Decide whether the next batch resends unchanged state.
+        
+        Called on the event loop before packing, so it never races with
+        the connect and drop paths that request a resync.
+        
+        Returns:
+            True on every BROADCAST_REFRESH_INTERVAL-th broadcast and after
+            a client joined or lost a state frame.
+        """
+        self._broadcast_count += 1
+        refresh = (
+            self._resync_pending
+            or self._broadcast_count % BROADCAST_REFRESH_INTERVAL == 0
+        )
+        self._resync_pending = False
+        return refresh
+    
+    def _pack_batch(
+        self,
+        entity_states: list,
+        bullet_states: list,
+        refresh: bool,
+        mode_type: int | None = None,
+        mode_payload: bytes = b"",
+    ) -> int:
+        """
+        Pack every state message for the tick into the send buffer.
+        
+        Builds one MSG_TYPE_BATCH frame at the start of _send_buf: type
+        bytes and lengths are written in place and entity/bullet records
+        are packed straight into it.
+        
+        Args:
+            entity_states: Agent states to pack.
+            bullet_states: Bullet states to pack.
+            refresh: Include entity/bullet payloads even if unchanged, as
+                returned by _take_refresh().
+            mode_type: Message type of the mode-specific payload.
+            mode_payload: Mode-specific payload, empty if there is none.
+        
+        Returns:
+            Length of the frame; 1 if it holds no messages.
+        """
+        # Grow the scratch buffer if this tick could overflow it
+        size = (
+            _BATCH_OVERHEAD
+            + StateEntity.packed_entities_size(len(entity_states))
+            + StateBullet.packed_bullets_size(len(bullet_states))
+            + len(mode_payload)
+        )
+        buf = self._send_buf
+        if len(buf) < size:
+            buf = self._send_buf = bytearray(size)
+        
+        buf[0] = MSG_TYPE_BATCH
+        offset, self._prev_entities = write_batch_states(
+            buf, 1, MSG_TYPE_ENTITIES, StateEntity.pack_entities_into,
+            entity_states, self._prev_entities, refresh,
+        )
+        offset, self._prev_bullets = write_batch_states(
+            buf, offset, MSG_TYPE_BULLETS, StateBullet.pack_bullets_into,
+            bullet_states, self._prev_bullets, refresh,
+        )
+        if mode_payload:
+            offset = write_batch_entry(buf, offset, mode_type, mode_payload)
+        
+        return offset
+    
+    def _send_batch(self, length: int) -> None:
+        """
+        Queue the frame packed by _pack_batch() for every client.
+        
+        Args:
+            length: Frame length returned by _pack_batch().
+        """
+        if length == 1:
+            return
+        
+        # Queued messages outlive this call, so hand out one exact copy
+        self._send_to_all(bytes(memoryview(self._send_buf)[:length]), droppable=True)
@@ -5,16 +5,17 @@ Waits for first client to select game mode, then initializes that mode.
 """
 
 import asyncio
+import concurrent.futures
+import json
+import logging
+import struct
 import time
 
 from quart import Quart, websocket
 
 from common.config import (
     NETWORK_UPDATE_RATE,
-    MSG_TYPE_BULLETS,
-    MSG_TYPE_ENTITIES,
     MSG_TYPE_CLIENT_READY,
-    MSG_TYPE_START_GAME,
         MSG_TYPE_GAME_END,
     MSG_TYPE_SELECT_MODE,
     MSG_TYPE_MODE_SELECTED,
@@ -22,36 +23,36 @@ from common.config import (
     GAME_MODE_KOTH,
     GAME_MODE_CTF,
     MSG_TYPE_CTF_STATE,
+    MSG_TYPE_KOTH_STATE,
     NETWORK_HOST,
     NETWORK_PORT,
     SIMULATION_TICK_RATE,
     WEBSOCKET_ROUTE,
 )
-from common.states.state_bullet import StateBullet
-from common.states.state_entity import StateEntity
-from server.config import REQUIRED_CLIENTS_TO_START
+from server.config import (
+    LOOP_MAX_CATCHUP_STEPS,
+    PACK_OFFLOAD_THRESHOLD,
+    REQUIRED_CLIENTS_TO_START,
+)
 from server.gameplay.game_manager import GameManager
 from server.gameplay.game_manager_koth import GameManagerKOTH
 from server.gameplay.game_manager_ctf import GameManagerCTF
+from server.network.client_broadcast import ClientBroadcastMixin, START_GAME_MSG
+from server.network.network_manager_base import (
+    TickSleeper,
+    install_uvloop,
+    raise_timer_resolution,
+    serve_app,
+)
 from common.logger import get_logger
 
-# KOTH-specific imports
-import sys
-import os
-# Add path for KOTH files
-koth_path = os.path.join(os.path.dirname(__file__), '..', '..', 'common')
-if koth_path not in sys.path:
-    sys.path.insert(0, koth_path)
-
-try:
-    from koth_config import MSG_TYPE_KOTH_STATE
-except ImportError:
-    MSG_TYPE_KOTH_STATE = 0x10  # Fallback
-
 logger = get_logger(__name__)
 
+# Precomputed [type][value] layout for control messages
+_TYPE_VALUE_STRUCT = struct.Struct("BB")
 
-class NetworkManagerUnified:
+
+class NetworkManagerUnified(ClientBroadcastMixin):
     """
     Unified WebSocket server supporting multiple game modes.
     
@@ -73,11 +74,26 @@ class NetworkManagerUnified:
         self.wall_config_file = wall_config_file
         self.game_manager = None
         self.game_mode = None
+        # Mode-specific state producers, resolved once per game manager
+        self._koth_pack = None
+        self._ctf_state = None
+        # MODE_SELECTED message for the agreed mode, encoded once on agreement
+        self._mode_selected_msg: bytes | None = None
         
         # MODIFICAT: Track individual client states
-        self.clients: dict = {}  # ws -> {'ready': bool, 'mode': int|None}
+        self.clients: set = set()  # Connected websockets
+        self.ready_clients: set = set()  # Websockets that sent CLIENT_READY
+        self.client_modes: dict = {}  # ws -> selected game mode
+        self._init_broadcast()
+        
+        # Single worker for packing large state lists off the event loop
+        self._pack_pool = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        # Single worker running simulation ticks so they don't stall client I/O
+        self._sim_pool = concurrent.futures.ThreadPoolExecutor(max_workers=1)
         
         self.required_clients = REQUIRED_CLIENTS_TO_START
+        # Set while at least required_clients are connected
+        self._enough_clients = asyncio.Event()
         self.game_task: asyncio.Task | None = None
         
         # ȘTERS: self.mode_locked - nu mai avem nevoie
@@ -92,8 +108,16 @@ class NetworkManagerUnified:
     async def handle_client(self) -> None:
         """Handle individual client connection lifecycle."""
         ws = websocket._get_current_object()
+        # No socket option setup here: asyncio and uvloop transports already
+        # disable Nagle on every accepted TCP socket, and Quart does not
+        # expose the raw socket. SO_SNDBUF is left to kernel autotuning;
+        # each tick is one batched frame and per-client backlog is bounded
+        # by the send deque instead.
 
-        self.clients[ws] = {'ready': False, 'mode': None}
+        self.clients.add(ws)
+        if len(self.clients) >= self.required_clients:
+            self._enough_clients.set()
+        self._add_client_queue(ws)
         
         try:
             client_id = getattr(ws, 'id', None) or id(ws)
@@ -102,25 +126,22 @@ class NetworkManagerUnified:
         
         logger.info("Client connected: %s (total=%d)", client_id, len(self.clients))
         
+        # Checked once per connection rather than on every frame
+        log_frames = logger.isEnabledFor(logging.DEBUG)
+        
         try:
             while True:
                 data = await websocket.receive()
                 if not data:
                     continue
                 
-                if (isinstance(data, bytes) or isinstance(data, str)) and len(data) >= 1:
-                    if isinstance(data, str):
-                        raw = data
-                        try:
-                            msg_type = ord(raw[0])
-                        except Exception:
-                            raw_b = raw.encode('latin-1', errors='ignore')
-                            msg_type = raw_b[0] if raw_b else None
-                    else:
-                        raw = data
-                        msg_type = data[0]
+                if isinstance(data, (bytes, str)):
+                    # Protocol is binary; a str frame is read by code point
+                    # rather than re-encoded just to get its first byte
+                    msg_type = data[0] if isinstance(data, bytes) else ord(data[0])
                     
-                    logger.debug("Received msg from %s: type=%s", client_id, msg_type)
+                    if log_frames:
+                        logger.debug("Received msg from %s: type=%s", client_id, msg_type)
                     
                     # Handle mode selection
                     if msg_type == MSG_TYPE_SELECT_MODE and len(data) >= 2:
@@ -129,9 +150,9 @@ class NetworkManagerUnified:
                     
                     # Handle ready message
                     elif msg_type == MSG_TYPE_CLIENT_READY:
-                        self.clients[ws]['ready'] = True
+                        self.ready_clients.add(ws)
                         
-                        ready_count = sum(1 for c in self.clients.values() if c['ready'])
+                        ready_count = len(self.ready_clients)
                         connected_count = len(self.clients)
                         logger.info(
                             "Client %s READY (%d/%d) required=%d",
@@ -141,23 +162,26 @@ class NetworkManagerUnified:
                             self.required_clients,
                         )
                         
-                        can_start = await self._check_can_start()
+                        can_start = self._check_can_start()
                         
                         if can_start and not self.game_task and self.game_manager is not None:
                             logger.info("Starting game: mode=%s ready=%d connected=%d", 
                                     "KOTH" if self.game_mode == GAME_MODE_KOTH else "Survival",
                                     ready_count, connected_count)
-                            await self._send_to_all(bytes([MSG_TYPE_START_GAME]))
+                            self._send_to_all(START_GAME_MSG)
                             self.game_task = asyncio.create_task(self._game_loop())
         
         except asyncio.CancelledError:
             pass
         finally:
-            if ws in self.clients:
-                del self.clients[ws]
+            self.clients.discard(ws)
+            self.ready_clients.discard(ws)
+            self.client_modes.pop(ws, None)
+            self._remove_client_queue(ws)
             
             # Stop game if not enough clients
             if len(self.clients) < self.required_clients:
+                self._enough_clients.clear()
                 if self.game_task:
                     self.game_task.cancel()
                     self.game_task = None
@@ -177,18 +201,13 @@ class NetworkManagerUnified:
         logger.info("Client %s selected mode: %s", client_id, mode_name)
         
         # Store this client's mode selection
-        self.clients[ws]['mode'] = mode
-        
-        # Check if all clients have selected a mode
-        modes_selected = [c['mode'] for c in self.clients.values() if c['mode'] is not None]
-        
-        if len(modes_selected) == 0:
-            return
+        self.client_modes[ws] = mode
         
         # Check if all selected modes are the same
-        if len(set(modes_selected)) == 1:
+        modes_selected = set(self.client_modes.values())
+        if len(modes_selected) == 1:
             # All clients agree on the mode!
-            agreed_mode = modes_selected[0]
+            agreed_mode = mode
             
             # Create game manager if not exists or mode changed
             if self.game_mode != agreed_mode:
@@ -204,8 +223,20 @@ class NetworkManagerUnified:
                     self.game_manager = GameManager(self.wall_config_file)
                     logger.info("Created GameManager - all clients agreed on Survival")
                 
+                self._koth_pack = (
+                    self.game_manager.koth_state.pack
+                    if agreed_mode == GAME_MODE_KOTH else None
+                )
+                self._ctf_state = (
+                    self.game_manager.get_ctf_state
+                    if agreed_mode == GAME_MODE_CTF else None
+                )
+                
                 # Notify all clients of the agreed mode
-                await self._send_to_all(bytes([MSG_TYPE_MODE_SELECTED, agreed_mode]))
+                self._mode_selected_msg = _TYPE_VALUE_STRUCT.pack(
+                    MSG_TYPE_MODE_SELECTED, agreed_mode
+                )
+                self._send_to_all(self._mode_selected_msg)
                 logger.info("All clients agree on mode: %s", mode_name)
         else:
             # Clients have different modes selected - wait for consensus
@@ -213,7 +244,7 @@ class NetworkManagerUnified:
             logger.debug("Current modes: %s", modes_selected)
     
     
-    async def _check_can_start(self) -> bool:
+    def _check_can_start(self) -> bool:
         """
         Check if game can start.
         
@@ -226,21 +257,20 @@ class NetworkManagerUnified:
         Returns:
             True if game can start, False otherwise.
         """
-        if len(self.clients) < self.required_clients:
-            return False
-        
-        # Check all clients are ready
-        if not all(c['ready'] for c in self.clients.values()):
+        # ready_clients is a subset of clients, so one count covers both
+        # the minimum-client and the everyone-ready requirements
+        ready_count = len(self.ready_clients)
+        if ready_count < self.required_clients or ready_count != len(self.clients):
             return False
         
         # Check all clients have selected a mode
-        modes = [c['mode'] for c in self.clients.values()]
-        if None in modes:
+        if len(self.client_modes) != len(self.clients):
             logger.info("Cannot start - not all clients have selected a mode")
             return False
         
         # Check all modes are the same
-        if len(set(modes)) != 1:
+        modes = set(self.client_modes.values())
+        if len(modes) != 1:
             logger.info("Cannot start - clients selected different modes: %s", modes)
             return False
         
@@ -265,28 +295,44 @@ class NetworkManagerUnified:
         mode_name = "KOTH" if self.game_mode == GAME_MODE_KOTH else ("CTF" if self.game_mode == GAME_MODE_CTF else "Survival")
         logger.info("Spawned agents for %s mode", mode_name)
         
-        next_tick = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        sleeper = TickSleeper()
+        last_time = time.perf_counter()
+        accumulator = 0.0
         time_since_broadcast = 0.0
         
         try:
             while (
                 self.game_manager.is_running
-                and len(self.clients) >= self.required_clients
+                and self._enough_clients.is_set()
             ):
                 current_time = time.perf_counter()
+                accumulator += current_time - last_time
+                last_time = current_time
                 
-                if current_time >= next_tick:
-                    self.game_manager.update(sim_dt)
+                # Run every whole tick that has elapsed, up to the catch-up cap
+                steps = 0
+                while accumulator >= sim_dt and steps < LOOP_MAX_CATCHUP_STEPS:
+                    # Awaited before broadcasting, so state is never packed
+                    # while the worker is mutating it
+                    await loop.run_in_executor(
+                        self._sim_pool, self.game_manager.update, sim_dt
+                    )
+                    accumulator -= sim_dt
+                    steps += 1
                     time_since_broadcast += sim_dt
                     
                     if time_since_broadcast >= broadcast_interval:
                         await self._broadcast()
                         time_since_broadcast = 0.0
-                    
-                    next_tick += sim_dt
-                else:
-                    sleep_time = max(0, next_tick - current_time)
-                    await asyncio.sleep(sleep_time)
+                
+                # Still behind after the cap: drop the backlog instead of
+                # spiralling further behind real time
+                if accumulator >= sim_dt:
+                    logger.debug("Game loop behind, dropping %.3fs", accumulator)
+                    accumulator %= sim_dt
+                
+                await sleeper.sleep(sim_dt - accumulator)
         
         except asyncio.CancelledError:
             self.game_manager.is_running = False
@@ -303,7 +349,7 @@ class NetworkManagerUnified:
 
                 logger.info("Game ended - broadcasting GAME_END (winner=%s) to clients", winner)
                 # Send winner as second byte
-                await self._send_to_all(bytes([MSG_TYPE_GAME_END, winner]))
+                self._send_to_all(_TYPE_VALUE_STRUCT.pack(MSG_TYPE_GAME_END, winner))
             except Exception:
                 logger.exception("Failed to broadcast GAME_END")
 
@@ -314,7 +360,7 @@ class NetworkManagerUnified:
                 await asyncio.sleep(disconnect_delay)
 
                 # Close all client websockets
-                clients_snapshot = list(self.clients.keys())
+                clients_snapshot = list(self.clients)
                 for c in clients_snapshot:
                     try:
                         await c.close(1000)
@@ -323,6 +369,8 @@ class NetworkManagerUnified:
 
                 # Clear client list
                 self.clients.clear()
+                self.ready_clients.clear()
+                self.client_modes.clear()
                 logger.info("All clients disconnected after game end")
             except Exception:
                 logger.exception("Error during post-game client disconnect sequence")
@@ -330,43 +378,57 @@ class NetworkManagerUnified:
             
     # Broadcasting
     
-    async def _send_to_all(self, msg: bytes) -> None:
-        """Send message to all connected clients."""
-        if self.clients:
-            await asyncio.gather(
-                *(client.send(msg) for client in self.clients),
-                return_exceptions=True,
-            )
+    def _pack_tick(self, entity_states: list, bullet_states: list, refresh: bool) -> int:
+        """
+        Pack the current mode's state for this tick into the send buffer.
+        
+        Args:
+            entity_states: Agent states to pack.
+            bullet_states: Bullet states to pack.
+            refresh: Include entity/bullet payloads even if unchanged.
+        
+        Returns:
+            Length of the MSG_TYPE_BATCH frame; 1 if it holds no messages.
+        """
+        # Mode state (KOTH or CTF only), packed first so it can be sized
+        mode_type = None
+        mode_payload = b""
+        if self._koth_pack is not None:
+            mode_type = MSG_TYPE_KOTH_STATE
+            mode_payload = self._koth_pack()
+        elif self._ctf_state is not None:
+            mode_type = MSG_TYPE_CTF_STATE
+            mode_payload = json.dumps(self._ctf_state()).encode('utf-8')
+        
+        return self._pack_batch(
+            entity_states, bullet_states, refresh, mode_type, mode_payload
+        )
     
     async def _broadcast(self) -> None:
-        """Pack and broadcast game state based on current mode."""
+        """
+        Pack game state for the current mode and broadcast it.
+        
+        All state messages for the tick are combined into one
+        MSG_TYPE_BATCH frame, so each client gets a single send per tick.
+        """
         if self.game_manager is None:
             return
         
-        # Entities (both modes)
-        entity_states = [agent.state for agent in self.game_manager.agents.values()]
-        entities_bytes = StateEntity.pack_entities(entity_states)
-        if entities_bytes:
-            await self._send_to_all(bytes([MSG_TYPE_ENTITIES]) + entities_bytes)
-        
-        # Bullets (both modes)
-        bullet_states = [bullet.state for bullet in self.game_manager.bullets.values()]
-        bullets_bytes = StateBullet.pack_bullets(bullet_states)
-        if bullets_bytes:
-            await self._send_to_all(bytes([MSG_TYPE_BULLETS]) + bullets_bytes)
-        
-        # KOTH state (only for KOTH mode)
-        if self.game_mode == GAME_MODE_KOTH and hasattr(self.game_manager, 'koth_state'):
-            koth_bytes = self.game_manager.koth_state.pack()
-            if koth_bytes:
-                await self._send_to_all(bytes([MSG_TYPE_KOTH_STATE]) + koth_bytes)
-        
-        # CTF state (only for CTF mode)
-        if self.game_mode == GAME_MODE_CTF and hasattr(self.game_manager, 'get_ctf_state'):
-            import json
-            ctf_state = self.game_manager.get_ctf_state()
-            ctf_json = json.dumps(ctf_state).encode('utf-8')
-            await self._send_to_all(bytes([MSG_TYPE_CTF_STATE]) + ctf_json)
+        # Decided here on the event loop; only the packer touches _prev_*
+        refresh = self._take_refresh()
+        entity_states, bullet_states = self._collect_states()
+        
+        # Small ticks pack inline to skip the hand-off cost; large ones go
+        # to the pack worker as one unit so client I/O keeps flowing
+        if len(entity_states) + len(bullet_states) <= PACK_OFFLOAD_THRESHOLD:
+            length = self._pack_tick(entity_states, bullet_states, refresh)
+        else:
+            loop = asyncio.get_running_loop()
+            length = await loop.run_in_executor(
+                self._pack_pool, self._pack_tick, entity_states, bullet_states, refresh
+            )
+        
+        self._send_batch(length)
     
     # Server management
     
@@ -378,6 +440,8 @@ class NetworkManagerUnified:
             host: Bind address.
             port: Listen port.
         """
+        install_uvloop()
+        raise_timer_resolution()
         logger.info("Starting unified server on %s:%d", host, port)
         logger.info("Waiting for clients to select game mode...")
-        self.app.run(host=host, port=port)
\ No newline at end of file
+        serve_app(self.app, host, port)
\ No newline at end of file
@@ -0,0 +1,382 @@
+"""
+Base Network Manager - shared client handling for single-mode servers.
+
+Handles client connections, the game loop and entity/bullet broadcasting.
+Subclasses add their mode-specific state through _pack_mode_state().
+"""
+
+import asyncio
+import atexit
+import logging
+import sys
+import time
+
+from hypercorn.asyncio import serve
+from hypercorn.config import Config as HypercornConfig
+from quart import Quart, websocket
+
+from common.config import (
+    NETWORK_UPDATE_RATE,
+    MSG_TYPE_CLIENT_READY,
+    NETWORK_HOST,
+    NETWORK_PORT,
+    SIMULATION_TICK_RATE,
+    WEBSOCKET_ROUTE,
+)
+from server.config import (
+    LOOP_MAX_CATCHUP_STEPS,
+    LOOP_MAX_SLEEP_SLACK,
+    LOOP_SLEEP_UNDERSHOOT,
+    LOOP_SPIN_THRESHOLD,
+    REQUIRED_CLIENTS_TO_START,
+    SERVER_BACKLOG,
+    WEBSOCKET_MAX_MESSAGE_SIZE,
+)
+from server.network.client_broadcast import ClientBroadcastMixin, START_GAME_MSG
+from common.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class TickSleeper:
+    """
+    Sleeps until a tick deadline with sub-millisecond accuracy.
+    
+    Timed sleeps overshoot by scheduler granularity, so this wakes early by
+    a slack margin and leaves the last stretch to sleep(0) yield-spins. The
+    slack grows to cover the worst oversleep seen (up to
+    LOOP_MAX_SLEEP_SLACK) and decays back toward LOOP_SLEEP_UNDERSHOOT, so
+    one stray hiccup does not leave the loop spinning for good.
+    """
+    
+    __slots__ = ("slack",)
+    
+    def __init__(self) -> None:
+        """Initialize with the minimum slack."""
+        self.slack = LOOP_SLEEP_UNDERSHOOT
+    
+    async def sleep(self, sleep_time: float) -> None:
+        """
+        Sleep for part of the time left until the next tick.
+        
+        Callers re-check the clock and call again until the tick is due.
+        
+        Args:
+            sleep_time: Seconds until the next tick.
+        """
+        timed = sleep_time - self.slack
+        if timed < LOOP_SPIN_THRESHOLD:
+            await asyncio.sleep(0)
+            return
+        
+        start = time.perf_counter()
+        await asyncio.sleep(timed)
+        oversleep = time.perf_counter() - start - timed
+        
+        if oversleep > self.slack:
+            self.slack = min(LOOP_MAX_SLEEP_SLACK, oversleep * 1.2)
+        else:
+            self.slack = max(LOOP_SLEEP_UNDERSHOOT, self.slack * 0.99)
+
+
+def install_uvloop() -> None:
+    """
+    Use uvloop as the asyncio event loop when it is available.
+
+    asyncio.run() creates its loop from the active policy, so installing
+    uvloop before serve_app() switches the server loop. Falls
+    back to the default loop where uvloop is missing (e.g. Windows).
+    """
+    try:
+        import uvloop
+    except ImportError:
+        logger.info("uvloop not installed, using default asyncio loop")
+        return
+
+    uvloop.install()
+    logger.info("Using uvloop event loop")
+
+
+def raise_timer_resolution() -> None:
+    """
+    Request 1 ms timer resolution on Windows for the life of the process.
+
+    The default Windows timer period is ~15.6 ms, coarser than a 60 Hz
+    tick, so every timed sleep in the game loop would overshoot. Other
+    platforms already have fine-grained timers and are left untouched.
+    """
+    if sys.platform != "win32":
+        return
+
+    import ctypes
+
+    winmm = ctypes.WinDLL("winmm")
+    if winmm.timeBeginPeriod(1) == 0:
+        atexit.register(winmm.timeEndPeriod, 1)
+        logger.info("Raised Windows timer resolution to 1 ms")
+
+
+def serve_app(app: Quart, host: str, port: int) -> None:
+    """
+    Serve a Quart app through Hypercorn, tuned for a game server.
+
+    app.run() enables a per-request access log and uses default limits.
+    Here access logging is off, the listen backlog is raised and inbound
+    messages are capped. Packed state frames do not compress, so the
+    bundled client disables permessage-deflate on its side; the server
+    does not enforce it for other clients.
+
+    Args:
+        app: Quart application to serve.
+        host: Bind address.
+        port: Listen port.
+    """
+    config = HypercornConfig()
+    config.bind = [f"{host}:{port}"]
+    config.accesslog = None
+    config.backlog = SERVER_BACKLOG
+    config.websocket_max_message_size = WEBSOCKET_MAX_MESSAGE_SIZE
+    asyncio.run(serve(app, config))
+
+
+class NetworkManagerBase(ClientBroadcastMixin):
+    """
+    WebSocket server for single-mode game state synchronization.
+    
+    Subclasses set MODE_NAME and MODE_MSG_TYPE and override
+    _pack_mode_state() to add their mode-specific message to each
+    broadcast. Overriding _pack_mode_state() without MODE_MSG_TYPE is
+    rejected when the subclass is defined.
+    """
+    
+    MODE_NAME = "base"
+    MODE_MSG_TYPE: int | None = None
+    
+    def __init_subclass__(cls, **kwargs) -> None:
+        """
+        Reject subclasses that send mode state without a message type.
+        
+        Raises:
+            TypeError: If _pack_mode_state() is overridden but
+                MODE_MSG_TYPE is left unset.
+        """
+        super().__init_subclass__(**kwargs)
+        if (
+            cls._pack_mode_state is not NetworkManagerBase._pack_mode_state
+            and cls.MODE_MSG_TYPE is None
+        ):
+            raise TypeError(
+                f"{cls.__name__} overrides _pack_mode_state() but does not set MODE_MSG_TYPE"
+            )
+    
+    def __init__(self, game_manager) -> None:
+        """
+        Initialize network manager.
+        
+        Args:
+            game_manager: Game manager instance for this mode.
+        """
+        self.app = Quart(__name__)
+        self.game_manager = game_manager
+        self.clients: dict = {}
+        self._init_broadcast()
+        
+        self._ready_count = 0
+        self.required_clients = REQUIRED_CLIENTS_TO_START
+        # Set while at least required_clients are connected
+        self._enough_clients = asyncio.Event()
+        self.game_task: asyncio.Task | None = None
+        self._broadcast_task: asyncio.Task | None = None
+        
+        # Register WebSocket endpoint
+        @self.app.websocket(WEBSOCKET_ROUTE)
+        async def ws_handler() -> None:
+            await self.handle_client()
+    
+    # Connection management
+    
+    async def handle_client(self) -> None:
+        """Handle individual client connection lifecycle."""
+        ws = websocket._get_current_object()
+        self.clients[ws] = False
+        self._add_client_queue(ws)
+        if len(self.clients) >= self.required_clients:
+            self._enough_clients.set()
+        
+        try:
+            client_id = getattr(ws, 'id', None) or id(ws)
+        except Exception:
+            client_id = id(ws)
+        
+        logger.info("Client connected: %s (connected=%d)", client_id, len(self.clients))
+        
+        # Checked once per connection rather than on every frame
+        log_frames = logger.isEnabledFor(logging.DEBUG)
+        
+        try:
+            while True:
+                data = await websocket.receive()
+                if not data:
+                    continue
+                
+                if isinstance(data, (bytes, str)):
+                    # Protocol is binary; a str frame is read by code point
+                    # rather than re-encoded just to get its first byte
+                    msg_type = data[0] if isinstance(data, bytes) else ord(data[0])
+                    
+                    if log_frames:
+                        logger.debug("Received msg from %s: type=%s", client_id, msg_type)
+                    
+                    if msg_type == MSG_TYPE_CLIENT_READY:
+                        if not self.clients[ws]:
+                            self.clients[ws] = True
+                            self._ready_count += 1
+                        
+                        ready_count = self._ready_count
+                        connected_count = len(self.clients)
+                        logger.info(
+                            "Client %s READY (%d/%d) required=%d",
+                            client_id,
+                            ready_count,
+                            connected_count,
+                            self.required_clients,
+                        )
+                        
+                        can_start = (
+                            ready_count >= self.required_clients
+                            or (connected_count > 0 and ready_count == connected_count)
+                        )
+                        
+                        if can_start and not self.game_task:
+                            logger.info(
+                                "Starting %s game: ready=%d connected=%d",
+                                self.MODE_NAME,
+                                ready_count,
+                                connected_count,
+                            )
+                            self._send_to_all(START_GAME_MSG)
+                            self.game_task = asyncio.create_task(self._game_loop())
+        
+        except asyncio.CancelledError:
+            pass
+        finally:
+            if ws in self.clients:
+                if self.clients.pop(ws):
+                    self._ready_count -= 1
+            self._remove_client_queue(ws)
+            
+            if len(self.clients) < self.required_clients:
+                self._enough_clients.clear()
+                if self.game_task:
+                    self.game_task.cancel()
+                    self.game_task = None
+                self.game_manager.is_running = False
+    
+    # Game loop
+    
+    async def _game_loop(self) -> None:
+        """
+        Main game loop; runs the simulation only.
+        
+        Broadcasts run on their own task at NETWORK_UPDATE_RATE, so a slow
+        send never delays the next simulation tick.
+        """
+        self.game_manager.is_running = True
+        
+        sim_dt = 1.0 / SIMULATION_TICK_RATE
+        
+        self.game_manager.spawn_test_agents()
+        self._broadcast_task = asyncio.create_task(self._broadcast_loop())
+        
+        sleeper = TickSleeper()
+        last_time = time.perf_counter()
+        accumulator = 0.0
+        
+        try:
+            while (
+                self.game_manager.is_running
+                and self._enough_clients.is_set()
+            ):
+                current_time = time.perf_counter()
+                accumulator += current_time - last_time
+                last_time = current_time
+                
+                # Run every whole tick that has elapsed, up to the catch-up cap
+                steps = 0
+                while accumulator >= sim_dt and steps < LOOP_MAX_CATCHUP_STEPS:
+                    self.game_manager.update(sim_dt)
+                    accumulator -= sim_dt
+                    steps += 1
+                
+                # Still behind after the cap: drop the backlog instead of
+                # spiralling further behind real time
+                if accumulator >= sim_dt:
+                    logger.debug("Game loop behind, dropping %.3fs", accumulator)
+                    accumulator %= sim_dt
+                
+                await sleeper.sleep(sim_dt - accumulator)
+        
+        except asyncio.CancelledError:
+            self.game_manager.is_running = False
+        finally:
+            if self._broadcast_task:
+                self._broadcast_task.cancel()
+                self._broadcast_task = None
+    
+    async def _broadcast_loop(self) -> None:
+        """Broadcast game state at NETWORK_UPDATE_RATE while the game runs."""
+        broadcast_interval = 1.0 / NETWORK_UPDATE_RATE
+        next_broadcast = time.perf_counter()
+        
+        try:
+            while self.game_manager.is_running and self._enough_clients.is_set():
+                await self._broadcast()
+                
+                # Fixed deadlines so send time does not stretch the interval
+                next_broadcast += broadcast_interval
+                await asyncio.sleep(max(0.0, next_broadcast - time.perf_counter()))
+        
+        except asyncio.CancelledError:
+            pass
+    
+    # Broadcasting
+    
+    def _pack_mode_state(self) -> bytes | None:
+        """
+        Pack the mode-specific state payload for this tick.
+        
+        Returns:
+            Payload for a MODE_MSG_TYPE message, without the type byte,
+            or None if the mode has no extra state.
+        """
+        return None
+    
+    async def _broadcast(self) -> None:
+        """
+        Pack game state and broadcast it as one MSG_TYPE_BATCH frame.
+        
+        Entities, bullets and the mode state share one frame, so each
+        client gets a single send per tick.
+        """
+        refresh = self._take_refresh()
+        entity_states, bullet_states = self._collect_states()
+        mode_payload = self._pack_mode_state() or b""
+        length = self._pack_batch(
+            entity_states, bullet_states, refresh, self.MODE_MSG_TYPE, mode_payload
+        )
+        self._send_batch(length)
+    
+    # Server management
+    
+    def run(self, host: str = NETWORK_HOST, port: int = NETWORK_PORT) -> None:
+        """
+        Start WebSocket server.
+        
+        Args:
+            host: Bind address.
+            port: Listen port.
+        """
+        install_uvloop()
+        raise_timer_resolution()
+        logger.info("Starting %s server on %s:%d", self.MODE_NAME, host, port)
+        serve_app(self.app, host, port)
@@ -7,6 +7,53 @@ import math
 from server.strategy.base import Strategy
 from common.config import Direction
 
+# All eight directions, built once for random picks
+_ALL_DIRECTIONS = tuple(Direction)
+_NUM_DIRECTIONS = len(_ALL_DIRECTIONS)
+
+# Bound once: the C-level generator call, without random.choice's
+# Python-level _randbelow rejection sampling
+_random = random.random
+
+# tan(22.5 deg): boundary between a straight and a diagonal octant
+_TAN_22_5 = math.tan(math.pi / 8)
+
+
+def _random_direction() -> Direction:
+    """
+    Pick one of the eight directions uniformly at random.
+    
+    Returns:
+        Direction enum value.
+    """
+    return _ALL_DIRECTIONS[int(_random() * _NUM_DIRECTIONS)]
+
+
+def _dxdy_to_direction(dx: float, dy: float) -> Direction:
+    """
+    Convert a vector to the nearest 8-direction without trigonometry.
+    
+    Only the octant of the vector matters, so it is picked from the signs
+    of the components and how far one dominates the other.
+    
+    Args:
+        dx: Vector x component.
+        dy: Vector y component (positive is NORTH, as with atan2).
+    
+    Returns:
+        Direction enum value.
+    """
+    abs_dx = abs(dx)
+    abs_dy = abs(dy)
+    
+    if abs_dy <= abs_dx * _TAN_22_5:
+        return Direction.EAST if dx >= 0 else Direction.WEST
+    if abs_dx <= abs_dy * _TAN_22_5:
+        return Direction.NORTH if dy > 0 else Direction.SOUTH
+    if dx > 0:
+        return Direction.NORTH_EAST if dy > 0 else Direction.SOUTH_EAST
+    return Direction.NORTH_WEST if dy > 0 else Direction.SOUTH_WEST
+
 
 class AggressiveSurvivalStrategy(Strategy):
     """
@@ -18,15 +65,23 @@ class AggressiveSurvivalStrategy(Strategy):
     - Simple but effective movement
     """
     
+    # Fixed attribute layout: no per-instance __dict__
+    __slots__ = ("direction_timer", "current_search_direction", "_tick")
+    
     # Configuration
     CHANGE_DIRECTION_INTERVAL = 0.2  # Change direction more frequently when searching
     HEALTH_RETREAT_THRESHOLD = 12.0  # Retreat only when very very low health
     CLOSE_COMBAT_DISTANCE = 120  # prefer to close in for lethal engagements
+    RETREAT_DISTANCE_SQ = 150 ** 2  # Squared range at which low health backs off
+    CLOSE_COMBAT_DISTANCE_SQ = CLOSE_COMBAT_DISTANCE ** 2
+    RAM_DISTANCE_SQ = 60 ** 2  # Squared range for dashing into the enemy
     
     def __init__(self) -> None:
         """Initialize strategy state."""
         self.direction_timer = 0.0
-        self.current_search_direction = random.choice(list(Direction))
+        self.current_search_direction = _random_direction()
+        # Frame counter driving the strafe zig-zag and dash cadence
+        self._tick = 0
     
     def execute(self, agent, dt: float) -> None:
         """
@@ -36,6 +91,8 @@ class AggressiveSurvivalStrategy(Strategy):
             agent: Agent instance to control.
             dt: Delta time in seconds.
         """
+        self._tick += 1
+        
         # Always detect enemies every frame for maximum responsiveness
         agent.detect_enemies()
         
@@ -59,19 +116,17 @@ class AggressiveSurvivalStrategy(Strategy):
             dt: Delta time.
         """
         # Prefer weakest (lowest health) visible enemy to focus-fire
-        target_id = None
+        agents_dict = agent.agents_dict
+        target = None
         min_health = float("inf")
         for eid in agent.detected_enemies:
-            if eid in agent.agents_dict:
-                e = agent.agents_dict[eid].state
-                if e.health < min_health:
-                    min_health = e.health
-                    target_id = eid
+            enemy = agents_dict.get(eid)
+            if enemy is not None and enemy.state.health < min_health:
+                min_health = enemy.state.health
+                target = enemy.state
 
-        if not target_id or target_id not in agent.agents_dict:
+        if target is None:
             return
-
-        target = agent.agents_dict[target_id].state
         
         # ALWAYS point gun at enemy (aim slightly ahead by nudging toward their facing)
         agent.point_gun_at(target.x, target.y)
@@ -80,31 +135,30 @@ class AggressiveSurvivalStrategy(Strategy):
         if agent.current_ammo > 0 and agent.reload_timer is None:
             agent.load_bullet()
         
-        # Calculate distance to enemy
+        # Calculate squared distance to enemy
         dx = target.x - agent.state.x
         dy = target.y - agent.state.y
-        distance = math.sqrt(dx * dx + dy * dy)
+        distance_sq = dx * dx + dy * dy
         
         # Movement strategy based on health and distance
         # Movement strategy: be more aggressive about closing gaps and finishing targets
-        if agent.health < self.HEALTH_RETREAT_THRESHOLD and distance < 150:
+        if agent.health < self.HEALTH_RETREAT_THRESHOLD and distance_sq < self.RETREAT_DISTANCE_SQ:
             # Very low health and enemy is close - back up a bit while firing if possible
-            retreat_angle = math.atan2(-dy, -dx)
-            direction = self._angle_to_direction(retreat_angle)
+            direction = _dxdy_to_direction(-dx, -dy)
             agent.move(dt, direction)
-        elif distance > self.CLOSE_COMBAT_DISTANCE:
+        elif distance_sq > self.CLOSE_COMBAT_DISTANCE_SQ:
             # Enemy is far - rush directly toward them to close distance quickly
             agent.move_towards(dt, target.x, target.y)
         else:
             # Close enough - perform aggressive strafing to maintain pressure
-            angle_to_enemy = math.atan2(dy, dx)
-            # Alternate strafing directions faster
-            strafe_sign = -1 if random.random() < 0.5 else 1
-            strafe_angle = angle_to_enemy + (math.pi / 2) * strafe_sign
-            direction = self._angle_to_direction(strafe_angle)
+            # Zig-zag strafe, flipping side every 8 frames: rotate the enemy vector 90 degrees
+            if self._tick & 8:
+                direction = _dxdy_to_direction(dy, -dx)
+            else:
+                direction = _dxdy_to_direction(-dy, dx)
             agent.move(dt, direction)
-            # If very close, sometimes dash directly into the enemy to ram shots
-            if distance < 60 and random.random() < 0.3:
+            # If very close, dash directly into the enemy every 4th frame to ram shots
+            if distance_sq < self.RAM_DISTANCE_SQ and (self._tick & 3) == 0:
                 agent.move_towards(dt, target.x, target.y)
     
     def _search_mode(self, agent, dt: float) -> None:
@@ -119,7 +173,7 @@ class AggressiveSurvivalStrategy(Strategy):
         
         # Change direction periodically while searching
         if self.direction_timer >= self.CHANGE_DIRECTION_INTERVAL:
-            self.current_search_direction = random.choice(list(Direction))
+            self.current_search_direction = _random_direction()
             self.direction_timer = 0.0
         
         # Keep moving in search direction
@@ -127,34 +181,5 @@ class AggressiveSurvivalStrategy(Strategy):
         
         # If blocked, immediately pick new direction
         if agent.is_blocked():
-            self.current_search_direction = random.choice(list(Direction))
+            self.current_search_direction = _random_direction()
             agent.move(dt, self.current_search_direction)
-    
-    def _angle_to_direction(self, angle: float) -> Direction:
-        """
-        Convert angle to nearest 8-direction.
-        
-        Args:
-            angle: Angle in radians.
-        
-        Returns:
-            Direction enum value.
-        """
-        # Normalize angle to [0, 2π)
-        angle = angle % (2 * math.pi)
-        
-        # Map to 8 directions
-        section = int((angle + math.pi / 8) / (math.pi / 4)) % 8
-        
-        directions = [
-            Direction.EAST,
-            Direction.NORTH_EAST,
-            Direction.NORTH,
-            Direction.NORTH_WEST,
-            Direction.WEST,
-            Direction.SOUTH_WEST,
-            Direction.SOUTH,
-            Direction.SOUTH_EAST,
-        ]
-        
-        return directions[section]
\ No newline at end of file
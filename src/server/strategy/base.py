@@ -10,6 +10,9 @@ class Strategy(ABC):
     using the provided agent API.
     """
 
+    # Empty so subclasses may declare their own __slots__
+    __slots__ = ()
+
     @abstractmethod
     def execute(self, agent, dt: float) -> None:
         """
@@ -23,6 +23,20 @@ from common.logger import get_logger
 
 logger = get_logger(__name__)
 
+# All eight directions, built once for random picks
+_ALL_DIRECTIONS = tuple(Direction)
+
+# Squared radius for comparing against squared distances
+_FLAG_RETURN_RADIUS_SQ = CTF_FLAG_RETURN_RADIUS ** 2
+
+# Math names bound once for the per-frame aim check
+_cos = math.cos
+_sin = math.sin
+
+# Gun counts as aimed within 30 degrees (0.52 rad) of the target; squared
+# cosine so the test works on squared distances
+_COS_AIM_TOLERANCE_SQ = math.cos(0.52) ** 2
+
 
 class CTFBaseDefenderStrategy(Strategy):
     """
@@ -35,12 +49,44 @@ class CTFBaseDefenderStrategy(Strategy):
     - If alone in team: Switch to attacker mode and capture enemy flag
     """
     
+    # Fixed attribute layout: no per-instance __dict__
+    __slots__ = (
+        "game_manager",
+        "direction_timer",
+        "patrol_direction",
+        "_stuck_counter",
+        "_stuck_check_timer",
+        "_last_x",
+        "_last_y",
+        "_avoidance_timer",
+        "_avoidance_direction",
+        "_is_alone",
+        "_alone_check_timer",
+        "_team",
+        "_own_flag",
+        "_enemy_flag",
+        "_own_base_x",
+        "_own_base_y",
+        "_enemy_base_x",
+        "_enemy_base_y",
+    )
+    
     # Configuration
     BASE_PATROL_RADIUS = 120.0  # Patrol radius around base
     TIGHT_DEFENSE_RADIUS = 80.0  # Close defense when flag at base
     HUNTER_MODE_RADIUS = 400.0  # Max distance to chase carrier
     CHANGE_DIRECTION_INTERVAL = 0.6  # Patrol direction change interval
     LOW_HEALTH_THRESHOLD = 20.0  # When to play more defensively
+    ALONE_CHECK_INTERVAL = 0.25  # How often to re-check if alone in team
+    STUCK_CHECK_INTERVAL = 0.1  # How often to sample movement for stuck detection
+    STUCK_MIN_MOVE_SQ = 6.0 ** 2  # Squared movement per sample below which we count as stuck
+    STUCK_SAMPLES = 3  # Stuck samples in a row (~0.3 seconds) before avoidance
+    CLOSE_RANGE_SQ = 150.0 ** 2  # Squared range to fire without aiming
+    
+    # Squared radii for comparing against squared distances
+    BASE_PATROL_RADIUS_SQ = BASE_PATROL_RADIUS ** 2
+    TIGHT_DEFENSE_RADIUS_SQ = TIGHT_DEFENSE_RADIUS ** 2
+    HUNTER_MODE_RADIUS_SQ = HUNTER_MODE_RADIUS ** 2
     
     def __init__(self, game_manager) -> None:
         """
@@ -51,13 +97,25 @@ class CTFBaseDefenderStrategy(Strategy):
         """
         self.game_manager = game_manager
         self.direction_timer = 0.0
-        self.patrol_direction = random.choice(list(Direction))
+        self.patrol_direction = random.choice(_ALL_DIRECTIONS)
         # Simple stuck detection
         self._stuck_counter = 0
-        self._last_position = None
+        self._stuck_check_timer = 0.0
+        # NaN until the first sample, so the first distance never counts as stuck
+        self._last_x = math.nan
+        self._last_y = math.nan
         self._avoidance_timer = 0.0
         self._avoidance_direction = None
         self._is_alone = False  # Track if bot is alone in team
+        self._alone_check_timer = self.ALONE_CHECK_INTERVAL  # Check on first frame
+        # Team-dependent flag and base references, filled on first execute
+        self._team = None
+        self._own_flag = None
+        self._enemy_flag = None
+        self._own_base_x = 0.0
+        self._own_base_y = 0.0
+        self._enemy_base_x = 0.0
+        self._enemy_base_y = 0.0
     
     def execute(self, agent, dt: float) -> None:
         """
@@ -67,8 +125,12 @@ class CTFBaseDefenderStrategy(Strategy):
             agent: Agent instance to control.
             dt: Delta time in seconds.
         """
-        # Always detect enemies
-        agent.detect_enemies()
+        # Refresh team references only if the team changed
+        if agent.state.team != self._team:
+            self._cache_team_refs(agent.state.team)
+        
+        # Always detect enemies (shared with the manager's periodic pass)
+        self.game_manager.detect_enemies(agent)
         
         # Check if we need to reload
         if agent.current_ammo == 0 and agent.reload_timer is None:
@@ -78,7 +140,7 @@ class CTFBaseDefenderStrategy(Strategy):
         self._check_stuck(agent, dt)
         
         # Check if we're alone in the team
-        self._check_if_alone(agent)
+        self._check_if_alone(agent, dt)
         
         # If alone, become attacker
         if self._is_alone:
@@ -91,21 +153,25 @@ class CTFBaseDefenderStrategy(Strategy):
         if agent.detected_enemies:
             self._combat(agent)
     
-    def _check_if_alone(self, agent) -> None:
+    def _check_if_alone(self, agent, dt: float) -> None:
         """
         Check if this bot is the last one alive in its team.
         
+        Reads the game manager's per-team alive counter, at most once every
+        ALONE_CHECK_INTERVAL seconds.
+        
         Args:
             agent: Agent instance.
+            dt: Delta time.
         """
-        teammates_alive = 0
-        for other_agent in self.game_manager.agents.values():
-            if other_agent.state.team == agent.state.team and other_agent.is_alive():
-                teammates_alive += 1
+        self._alone_check_timer += dt
+        if self._alone_check_timer < self.ALONE_CHECK_INTERVAL:
+            return
+        self._alone_check_timer = 0.0
         
         # If only 1 agent (this bot) is alive, switch to attacker
         was_alone = self._is_alone
-        self._is_alone = (teammates_alive == 1)
+        self._is_alone = (self.game_manager.team_alive_count[agent.state.team] == 1)
         
         # Log when status changes
         if not was_alone and self._is_alone:
@@ -121,37 +187,34 @@ class CTFBaseDefenderStrategy(Strategy):
             agent: Agent instance.
             dt: Delta time.
         """
-        current_pos = (agent.state.x, agent.state.y)
-        
-        # Initialize last position
-        if self._last_position is None:
-            self._last_position = current_pos
-            return
-        
-        # Calculate movement distance
-        dx = current_pos[0] - self._last_position[0]
-        dy = current_pos[1] - self._last_position[1]
-        distance_moved = math.sqrt(dx * dx + dy * dy)
-        
-        # If moved less than 1 pixel, increment stuck counter
-        if distance_moved < 1.0:
-            self._stuck_counter += 1
-        else:
-            self._stuck_counter = 0  # Reset when moving
-        
-        self._last_position = current_pos
-        
-        # If stuck for 20 frames (~0.33 seconds), activate avoidance
-        if self._stuck_counter >= 20 and self._avoidance_timer <= 0:
-            # Pick a random direction
-            all_directions = [
-                Direction.NORTH, Direction.NORTH_EAST, Direction.EAST, Direction.SOUTH_EAST,
-                Direction.SOUTH, Direction.SOUTH_WEST, Direction.WEST, Direction.NORTH_WEST
-            ]
-            self._avoidance_direction = random.choice(all_directions)
-            # Go in that direction for 0.5-1.0 seconds
-            self._avoidance_timer = random.uniform(0.5, 1.0)
-            self._stuck_counter = 0  # Reset counter
+        # Sample movement at STUCK_CHECK_INTERVAL; per-frame steps are noise
+        self._stuck_check_timer += dt
+        if self._stuck_check_timer >= self.STUCK_CHECK_INTERVAL:
+            self._stuck_check_timer = 0.0
+            
+            # Calculate squared movement distance since the last sample
+            x = agent.state.x
+            y = agent.state.y
+            dx = x - self._last_x
+            dy = y - self._last_y
+            distance_moved_sq = dx * dx + dy * dy
+            
+            # If barely moved, increment stuck counter
+            if distance_moved_sq < self.STUCK_MIN_MOVE_SQ:
+                self._stuck_counter += 1
+            else:
+                self._stuck_counter = 0  # Reset when moving
+            
+            self._last_x = x
+            self._last_y = y
+            
+            # If stuck for STUCK_SAMPLES samples, activate avoidance
+            if self._stuck_counter >= self.STUCK_SAMPLES and self._avoidance_timer <= 0:
+                # Pick a random direction
+                self._avoidance_direction = random.choice(_ALL_DIRECTIONS)
+                # Go in that direction for 0.5-1.0 seconds
+                self._avoidance_timer = random.uniform(0.5, 1.0)
+                self._stuck_counter = 0  # Reset counter
         
         # Apply avoidance if active
         if self._avoidance_timer > 0:
@@ -173,8 +236,11 @@ class CTFBaseDefenderStrategy(Strategy):
         if self._avoidance_timer > 0:
             return
         
-        own_flag = self._get_own_flag(agent)
-        own_base_x, own_base_y = self._get_own_base(agent)
+        own_flag = self._own_flag
+        own_base_x = self._own_base_x
+        own_base_y = self._own_base_y
+        ax = agent.state.x
+        ay = agent.state.y
         
         # Priority 1: If flag is dropped, GO GET IT IMMEDIATELY
         if own_flag.state == 2:  # FlagState.DROPPED
@@ -185,16 +251,17 @@ class CTFBaseDefenderStrategy(Strategy):
         
         # Priority 2: If flag is taken, HUNT THE CARRIER
         if own_flag.state == 1:  # FlagState.CARRIED
-            if own_flag.carrier_id and own_flag.carrier_id in agent.agents_dict:
-                carrier = agent.agents_dict[own_flag.carrier_id].state
+            carrier_agent = agent.agents_dict.get(own_flag.carrier_id)
+            if own_flag.carrier_id is not None and carrier_agent is not None:
+                carrier = carrier_agent.state
                 
-                # Calculate distance to carrier
-                dx = carrier.x - agent.state.x
-                dy = carrier.y - agent.state.y
-                distance = math.sqrt(dx * dx + dy * dy)
+                # Calculate squared distance to carrier
+                dx = carrier.x - ax
+                dy = carrier.y - ay
+                distance_sq = dx * dx + dy * dy
                 
                 # Only chase if within reasonable distance
-                if distance <= self.HUNTER_MODE_RADIUS:
+                if distance_sq <= self.HUNTER_MODE_RADIUS_SQ:
                     agent.move_towards(dt, carrier.x, carrier.y)
                     agent.point_gun_at(carrier.x, carrier.y)
                     
@@ -204,14 +271,14 @@ class CTFBaseDefenderStrategy(Strategy):
                     return
         
         # Priority 3: Normal patrol around base
-        dx = agent.state.x - own_base_x
-        dy = agent.state.y - own_base_y
-        distance_to_base = math.sqrt(dx * dx + dy * dy)
+        dx = ax - own_base_x
+        dy = ay - own_base_y
+        distance_to_base_sq = dx * dx + dy * dy
         
         # Use tighter patrol if flag is safe at base
-        patrol_radius = self.TIGHT_DEFENSE_RADIUS if own_flag.state == 0 else self.BASE_PATROL_RADIUS
+        patrol_radius_sq = self.TIGHT_DEFENSE_RADIUS_SQ if own_flag.state == 0 else self.BASE_PATROL_RADIUS_SQ
         
-        if distance_to_base > patrol_radius:
+        if distance_to_base_sq > patrol_radius_sq:
             # Too far from base - return
             agent.move_towards(dt, own_base_x, own_base_y)
             if not agent.detected_enemies:
@@ -220,21 +287,20 @@ class CTFBaseDefenderStrategy(Strategy):
             # Patrol around base
             self.direction_timer += dt
             if self.direction_timer >= self.CHANGE_DIRECTION_INTERVAL:
-                self.patrol_direction = random.choice(list(Direction))
+                self.patrol_direction = random.choice(_ALL_DIRECTIONS)
                 self.direction_timer = 0.0
             
             agent.move(dt, self.patrol_direction)
             
             # If blocked, change direction immediately
             if agent.is_blocked():
-                self.patrol_direction = random.choice(list(Direction))
+                self.patrol_direction = random.choice(_ALL_DIRECTIONS)
                 agent.move(dt, self.patrol_direction)
         
         # Always scan for threats when not engaging
         if not agent.detected_enemies:
             # Look toward enemy side
-            enemy_base_x, enemy_base_y = self._get_enemy_base(agent)
-            agent.point_gun_at(enemy_base_x, enemy_base_y)
+            agent.point_gun_at(self._enemy_base_x, self._enemy_base_y)
     
     def _attacker_behavior(self, agent, dt: float) -> None:
         """
@@ -244,21 +310,21 @@ class CTFBaseDefenderStrategy(Strategy):
             agent: Agent instance.
             dt: Delta time.
         """
-        enemy_flag = self._get_enemy_flag(agent)
-        own_flag = self._get_own_flag(agent)
+        enemy_flag = self._enemy_flag
         
         # Am I carrying the enemy flag?
         if enemy_flag.carrier_id == agent.state.id_entity:
             # Bring it home!
-            own_base_x, own_base_y = self._get_own_base(agent)
+            own_base_x = self._own_base_x
+            own_base_y = self._own_base_y
             
-            # Calculate distance to base
+            # Calculate squared distance to base
             dx = own_base_x - agent.state.x
             dy = own_base_y - agent.state.y
-            distance = math.sqrt(dx * dx + dy * dy)
+            distance_sq = dx * dx + dy * dy
             
             # If close enough to capture, stop moving
-            if distance <= CTF_FLAG_RETURN_RADIUS:
+            if distance_sq <= _FLAG_RETURN_RADIUS_SQ:
                 if agent.detected_enemies:
                     pass  # Just defend
                 else:
@@ -295,58 +361,54 @@ class CTFBaseDefenderStrategy(Strategy):
         """
         # Find closest enemy
         target_id = agent.get_closest_enemy()
-        if not target_id or target_id not in agent.agents_dict:
+        target_agent = agent.agents_dict.get(target_id) if target_id else None
+        if target_agent is None:
             return
         
-        target = agent.agents_dict[target_id].state
-        
-        # Calculate distance to target
-        dx = target.x - agent.state.x
-        dy = target.y - agent.state.y
-        distance = math.sqrt(dx * dx + dy * dy)
+        state = agent.state
+        target = target_agent.state
         
-        # Always aim at enemy
+        # Always aim at enemy, so the gun tracks it through reloads
         agent.point_gun_at(target.x, target.y)
         
-        # Shoot if we have ammo and are not reloading
-        if agent.current_ammo > 0 and agent.reload_timer is None:
-            # Check if gun is roughly aimed (within 30 degrees)
-            target_angle = math.atan2(dy, dx)
-            angle_diff = abs(target_angle - agent.state.gun_angle)
-            # Normalize angle difference to [-pi, pi]
-            while angle_diff > math.pi:
-                angle_diff -= 2 * math.pi
-            while angle_diff < -math.pi:
-                angle_diff += 2 * math.pi
-            
-            # Shoot if roughly aimed or close range
-            if abs(angle_diff) < 0.52 or distance < 150.0:
-                agent.load_bullet()
-    
-    def _get_enemy_flag(self, agent):
-        """Get enemy flag reference."""
-        if agent.state.team == Team.TEAM_A:
-            return self.game_manager.flag_team_b
-        else:
-            return self.game_manager.flag_team_a
-    
-    def _get_own_flag(self, agent):
-        """Get own flag reference."""
-        if agent.state.team == Team.TEAM_A:
-            return self.game_manager.flag_team_a
-        else:
-            return self.game_manager.flag_team_b
-    
-    def _get_own_base(self, agent) -> tuple[float, float]:
-        """Get own base coordinates."""
-        if agent.state.team == Team.TEAM_A:
-            return (CTF_FLAG_TEAM_A_BASE_X, CTF_FLAG_TEAM_A_BASE_Y)
-        else:
-            return (CTF_FLAG_TEAM_B_BASE_X, CTF_FLAG_TEAM_B_BASE_Y)
+        # Out of ammo or reloading - skip the aim check entirely
+        if agent.current_ammo <= 0 or agent.reload_timer is not None:
+            return
+        
+        # Calculate squared distance to target
+        dx = target.x - state.x
+        dy = target.y - state.y
+        distance_sq = dx * dx + dy * dy
+        
+        # Check if gun is roughly aimed (within 30 degrees). gun_angle is in
+        # screen space (y down), so the barrel points along (cos, -sin)
+        gun_angle = state.gun_angle
+        dot = _cos(gun_angle) * dx - _sin(gun_angle) * dy
+        aimed = dot > 0 and dot * dot > _COS_AIM_TOLERANCE_SQ * distance_sq
+        
+        # Shoot if roughly aimed or close range
+        if aimed or distance_sq < self.CLOSE_RANGE_SQ:
+            agent.load_bullet()
     
-    def _get_enemy_base(self, agent) -> tuple[float, float]:
-        """Get enemy base coordinates."""
-        if agent.state.team == Team.TEAM_A:
-            return (CTF_FLAG_TEAM_B_BASE_X, CTF_FLAG_TEAM_B_BASE_Y)
+    def _cache_team_refs(self, team: int) -> None:
+        """
+        Cache own/enemy flag references and base coordinates for a team.
+        
+        Args:
+            team: Team of the controlled agent.
+        """
+        self._team = team
+        if team == Team.TEAM_A:
+            self._own_flag = self.game_manager.flag_team_a
+            self._enemy_flag = self.game_manager.flag_team_b
+            self._own_base_x = CTF_FLAG_TEAM_A_BASE_X
+            self._own_base_y = CTF_FLAG_TEAM_A_BASE_Y
+            self._enemy_base_x = CTF_FLAG_TEAM_B_BASE_X
+            self._enemy_base_y = CTF_FLAG_TEAM_B_BASE_Y
         else:
-            return (CTF_FLAG_TEAM_A_BASE_X, CTF_FLAG_TEAM_A_BASE_Y)
+            self._own_flag = self.game_manager.flag_team_b
+            self._enemy_flag = self.game_manager.flag_team_a
+            self._own_base_x = CTF_FLAG_TEAM_B_BASE_X
+            self._own_base_y = CTF_FLAG_TEAM_B_BASE_Y
+            self._enemy_base_x = CTF_FLAG_TEAM_A_BASE_X
+            self._enemy_base_y = CTF_FLAG_TEAM_A_BASE_Y
@@ -16,12 +16,75 @@ from common.ctf_config import (
     CTF_FLAG_TEAM_B_BASE_X,
     CTF_FLAG_TEAM_B_BASE_Y,
     CTF_FLAG_PICKUP_RADIUS,
+    CTF_FLAG_RETURN_RADIUS,
 )
 from common.states.state_entity import Team
 from common.logger import get_logger
 
 logger = get_logger(__name__)
 
+# All eight directions, built once for random picks
+_ALL_DIRECTIONS = tuple(Direction)
+_NUM_DIRECTIONS = len(_ALL_DIRECTIONS)
+
+# Bound once: the C-level generator call, without random.choice's
+# Python-level _randbelow rejection sampling
+_random = random.random
+
+# Squared radius for comparing against squared distances
+_FLAG_RETURN_RADIUS_SQ = CTF_FLAG_RETURN_RADIUS ** 2
+
+# Directions by counter-clockwise octant, starting at EAST (angle 0)
+_OCTANTS = (
+    Direction.EAST,
+    Direction.NORTH_EAST,
+    Direction.NORTH,
+    Direction.NORTH_WEST,
+    Direction.WEST,
+    Direction.SOUTH_WEST,
+    Direction.SOUTH,
+    Direction.SOUTH_EAST,
+)
+
+# atan2 returns [-pi, pi]; shifting by 2pi + pi/8 keeps the bucket positive
+# and centres each octant on its direction
+_OCTANT_OFFSET = 2 * math.pi + math.pi / 8
+_OCTANTS_PER_RADIAN = 4 / math.pi
+
+# Math names bound once for the per-frame role behaviors
+_atan2 = math.atan2
+_sqrt = math.sqrt
+_cos = math.cos
+_sin = math.sin
+
+# Gun counts as aimed within 30 degrees (0.52 rad) of the target; squared
+# cosine so the test works on squared distances
+_COS_AIM_TOLERANCE_SQ = math.cos(0.52) ** 2
+
+
+def _random_direction() -> Direction:
+    """
+    Pick one of the eight directions uniformly at random.
+    
+    Returns:
+        Direction enum value.
+    """
+    return _ALL_DIRECTIONS[int(_random() * _NUM_DIRECTIONS)]
+
+
+def _dxdy_to_direction(dx: float, dy: float) -> Direction:
+    """
+    Convert a vector to the nearest 8-direction.
+    
+    Args:
+        dx: Vector x component.
+        dy: Vector y component.
+    
+    Returns:
+        Direction enum value.
+    """
+    return _OCTANTS[int((_atan2(dy, dx) + _OCTANT_OFFSET) * _OCTANTS_PER_RADIAN) & 7]
+
 
 class CTFRole(IntEnum):
     """Bot role enumeration."""
@@ -42,12 +105,38 @@ class CTFStrategy(Strategy):
     - Escorts support friendly carrier
     """
     
+    # Fixed attribute layout: no per-instance __dict__
+    __slots__ = (
+        "game_manager",
+        "role",
+        "_is_escort",
+        "_stuck_counter",
+        "_last_x",
+        "_last_y",
+        "_avoidance_timer",
+        "_avoidance_direction",
+        "_last_distance",
+        "_carrier_log_timer",
+        "_team",
+        "_enemy_team",
+        "_own_flag",
+        "_enemy_flag",
+        "_own_base_x",
+        "_own_base_y",
+    )
+    
     # Configuration
     LOW_HEALTH_THRESHOLD = 25.0  # When to retreat
     CARRIER_ESCORT_DISTANCE = 120.0  # Distance to maintain from carrier
     CARRIER_MIN_DISTANCE = 60.0  # Minimum distance to avoid crowding carrier
     HUNTER_AGGRESSION_RANGE = 250.0  # Range to chase carrier
     ESCORT_LATERAL_OFFSET = 80.0  # Lateral offset for escort positioning
+    CLOSE_RANGE_SQ = 150.0 ** 2  # Squared range to fire without aiming
+    
+    # Squared distances for comparing against squared distances
+    CARRIER_ESCORT_DISTANCE_SQ = CARRIER_ESCORT_DISTANCE ** 2
+    CARRIER_MIN_DISTANCE_SQ = CARRIER_MIN_DISTANCE ** 2
+    HUNTER_AGGRESSION_RANGE_SQ = HUNTER_AGGRESSION_RANGE ** 2
     
     def __init__(self, game_manager) -> None:
         """
@@ -62,10 +151,23 @@ class CTFStrategy(Strategy):
         self._is_escort = None
         # Simple stuck detection
         self._stuck_counter = 0
-        self._last_position = None
+        # NaN until the first sample, so the first distance never counts as stuck
+        self._last_x = math.nan
+        self._last_y = math.nan
         # Avoidance: just pick a random direction and go for a time
         self._avoidance_timer = 0.0
         self._avoidance_direction = None
+        # Carrier progress: distance to base on the previous frame (None until
+        # first carrying) and time since the last progress log
+        self._last_distance = None
+        self._carrier_log_timer = 0.0
+        # Team-dependent flag and base references, filled on first execute
+        self._team = None
+        self._enemy_team = None
+        self._own_flag = None
+        self._enemy_flag = None
+        self._own_base_x = 0.0
+        self._own_base_y = 0.0
     
     def execute(self, agent, dt: float) -> None:
         """
@@ -75,8 +177,12 @@ class CTFStrategy(Strategy):
             agent: Agent instance to control.
             dt: Delta time in seconds.
         """
-        # Always detect enemies
-        agent.detect_enemies()
+        # Refresh team references only if the team changed
+        if agent.state.team != self._team:
+            self._cache_team_refs(agent.state.team)
+        
+        # Always detect enemies (shared with the manager's periodic pass)
+        self.game_manager.detect_enemies(agent)
         
         # Check if we need to reload
         if agent.current_ammo == 0 and agent.reload_timer is None:
@@ -116,34 +222,26 @@ class CTFStrategy(Strategy):
             agent: Agent instance.
             dt: Delta time.
         """
-        current_pos = (agent.state.x, agent.state.y)
-        
-        # Initialize last position
-        if self._last_position is None:
-            self._last_position = current_pos
-            return
-        
-        # Calculate movement distance
-        dx = current_pos[0] - self._last_position[0]
-        dy = current_pos[1] - self._last_position[1]
-        distance_moved = math.sqrt(dx * dx + dy * dy)
+        # Calculate squared movement distance
+        x = agent.state.x
+        y = agent.state.y
+        dx = x - self._last_x
+        dy = y - self._last_y
+        distance_moved_sq = dx * dx + dy * dy
         
         # If moved less than 1 pixel, increment stuck counter
-        if distance_moved < 1.0:
+        if distance_moved_sq < 1.0:
             self._stuck_counter += 1
         else:
             self._stuck_counter = 0  # Reset when moving
         
-        self._last_position = current_pos
+        self._last_x = x
+        self._last_y = y
         
         # If stuck for 20 frames (~0.33 seconds), activate avoidance
         if self._stuck_counter >= 20 and self._avoidance_timer <= 0:
             # Pick a random direction
-            all_directions = [
-                Direction.NORTH, Direction.NORTH_EAST, Direction.EAST, Direction.SOUTH_EAST,
-                Direction.SOUTH, Direction.SOUTH_WEST, Direction.WEST, Direction.NORTH_WEST
-            ]
-            self._avoidance_direction = random.choice(all_directions)
+            self._avoidance_direction = _random_direction()
             # Go in that direction for 0.5-1.0 seconds
             self._avoidance_timer = random.uniform(0.5, 1.0)
             self._stuck_counter = 0  # Reset counter
@@ -163,54 +261,39 @@ class CTFStrategy(Strategy):
         Args:
             agent: Agent instance.
         """
-        enemy_flag = self._get_enemy_flag(agent)
-        own_flag = self._get_own_flag(agent)
-        
         # Am I carrying the flag?
-        if enemy_flag.carrier_id == agent.state.id_entity:
+        if self._enemy_flag.carrier_id == agent.state.id_entity:
             self.role = CTFRole.CARRIER
             return
         
-        # CRITICAL: Is a TEAMMATE carrying the enemy flag?
-        if enemy_flag.state == 1 and enemy_flag.carrier_id:  # FlagState.CARRIED
-            # Check if carrier is a teammate
-            if enemy_flag.carrier_id in agent.agents_dict:
-                carrier_agent = agent.agents_dict[enemy_flag.carrier_id]
-                if carrier_agent.state.team == agent.state.team:
-                    # Teammate has flag! Don't crowd them
-                    # Make PERMANENT assignment (don't re-randomize every frame!)
-                    # Initialize _is_escort if not present (backward compatibility)
-                    if not hasattr(self, '_is_escort'):
-                        self._is_escort = None
-                    
-                    if self._is_escort is None:
-                        # First time seeing carrier - assign role permanently
-                        self._is_escort = random.random() < 0.5
-                    
-                    if self._is_escort:
-                        self.role = CTFRole.ESCORT
-                        return
-                    else:
-                        # Stay at base but as attacker ready to push
-                        self.role = CTFRole.ATTACKER
-                        return
+        # Carriers are resolved once per tick by the game manager
+        carriers = self.game_manager.flag_carriers
         
-        # Is our flag taken? Hunt the carrier!
-        if own_flag.state == 1:  # FlagState.CARRIED
-            # Check if carrier exists and is alive
-            if own_flag.carrier_id and own_flag.carrier_id in agent.agents_dict:
-                carrier = agent.agents_dict[own_flag.carrier_id].state
-                dx = agent.state.x - carrier.x
-                dy = agent.state.y - carrier.y
-                distance = math.sqrt(dx * dx + dy * dy)
-                
-                if distance < self.HUNTER_AGGRESSION_RANGE:
-                    self.role = CTFRole.HUNTER
-                    return
+        # CRITICAL: Is a TEAMMATE carrying the enemy flag?
+        if carriers[self._team] is not None:
+            # Teammate has flag! Don't crowd them
+            # Make PERMANENT assignment (don't re-randomize every frame!)
+            if self._is_escort is None:
+                # First time seeing carrier - assign role permanently
+                self._is_escort = _random() < 0.5
+            
+            if self._is_escort:
+                self.role = CTFRole.ESCORT
             else:
-                # Carrier doesn't exist but flag is marked as carried - flag logic bug?
-                # Just become attacker to keep moving
+                # Stay at base but as attacker ready to push
                 self.role = CTFRole.ATTACKER
+            return
+        
+        # Is our flag taken? Hunt the carrier!
+        carrier_agent = carriers[self._enemy_team]
+        if carrier_agent is not None:
+            carrier = carrier_agent.state
+            dx = agent.state.x - carrier.x
+            dy = agent.state.y - carrier.y
+            distance_sq = dx * dx + dy * dy
+            
+            if distance_sq < self.HUNTER_AGGRESSION_RANGE_SQ:
+                self.role = CTFRole.HUNTER
                 return
         
         # Default: be an attacker (base defense handled by CTFBaseDefenderStrategy)
@@ -224,7 +307,7 @@ class CTFStrategy(Strategy):
             agent: Agent instance.
             dt: Delta time.
         """
-        enemy_flag = self._get_enemy_flag(agent)
+        enemy_flag = self._enemy_flag
         
         # If avoidance is active, let it handle movement
         if self._avoidance_timer > 0:
@@ -245,15 +328,17 @@ class CTFStrategy(Strategy):
             agent: Agent instance.
             dt: Delta time.
         """
-        own_base_x, own_base_y = self._get_own_base(agent)
+        own_base_x = self._own_base_x
+        own_base_y = self._own_base_y
         
         # Calculate distance to base
         dx = own_base_x - agent.state.x
         dy = own_base_y - agent.state.y
-        distance = math.sqrt(dx * dx + dy * dy)
+        distance_sq = dx * dx + dy * dy
+        distance = _sqrt(distance_sq)
         
         # Track if carrier is stuck (distance not changing)
-        if not hasattr(self, '_last_distance'):
+        if self._last_distance is None:
             self._last_distance = distance
             self._stuck_counter = 0
         
@@ -267,10 +352,7 @@ class CTFStrategy(Strategy):
         self._last_distance = distance
         
         # Log carrier progress every 2 seconds
-        if hasattr(self, '_carrier_log_timer'):
-            self._carrier_log_timer += dt
-        else:
-            self._carrier_log_timer = 0.0
+        self._carrier_log_timer += dt
         
         if self._carrier_log_timer >= 2.0:
             logger.info(f"Carrier #{agent.state.id_entity} distance to base: {distance:.1f} pixels (stuck_counter={self._stuck_counter})")
@@ -283,8 +365,7 @@ class CTFStrategy(Strategy):
         
         # If close enough to capture, stop moving and just wait for capture
         # This prevents blocking and struggling at the base entrance
-        from common.ctf_config import CTF_FLAG_RETURN_RADIUS
-        if distance <= CTF_FLAG_RETURN_RADIUS:
+        if distance_sq <= _FLAG_RETURN_RADIUS_SQ:
             # Close enough! Stop moving, just point gun at enemies
             # Game manager will detect capture automatically
             if agent.detected_enemies:
@@ -315,38 +396,22 @@ class CTFStrategy(Strategy):
             agent: Agent instance.
             dt: Delta time.
         """
-        # Initialize if missing (defensive)
-        if not hasattr(self, '_is_escort'):
-            self._is_escort = None
-        
-        enemy_flag = self._get_enemy_flag(agent)
-        
         # Verify teammate still has flag
-        if enemy_flag.state != 1 or not enemy_flag.carrier_id:
+        carrier_agent = self.game_manager.flag_carriers[self._team]
+        if carrier_agent is None:
             # Flag not carried anymore - reset escort assignment
             self._is_escort = None
             self.role = CTFRole.ATTACKER
             return
         
-        if enemy_flag.carrier_id not in agent.agents_dict:
-            self._is_escort = None
-            self.role = CTFRole.ATTACKER
-            return
-        
-        carrier_agent = agent.agents_dict[enemy_flag.carrier_id]
-        if carrier_agent.state.team != agent.state.team:
-            # Not our teammate
-            self._is_escort = None
-            self.role = CTFRole.ATTACKER
-            return
-        
         carrier_pos = carrier_agent.state
-        own_base_x, own_base_y = self._get_own_base(agent)
+        own_base_x = self._own_base_x
+        own_base_y = self._own_base_y
         
         # Calculate vector from carrier to base
         base_dx = own_base_x - carrier_pos.x
         base_dy = own_base_y - carrier_pos.y
-        base_distance = math.sqrt(base_dx * base_dx + base_dy * base_dy)
+        base_distance = _sqrt(base_dx * base_dx + base_dy * base_dy)
         
         if base_distance < 0.01:
             # Carrier at base, become attacker and reset assignment
@@ -356,29 +421,28 @@ class CTFStrategy(Strategy):
         
         # Calculate escort position: lateral to carrier's path
         # Position ourselves to the side of carrier, not behind them
-        base_angle = math.atan2(base_dy, base_dx)
         
         # Alternate between left and right side based on agent ID
         side_multiplier = 1 if agent.state.id_entity % 2 == 0 else -1
-        lateral_angle = base_angle + (math.pi / 2) * side_multiplier
         
-        # Target position: offset from carrier laterally
-        target_x = carrier_pos.x + math.cos(lateral_angle) * self.ESCORT_LATERAL_OFFSET
-        target_y = carrier_pos.y + math.sin(lateral_angle) * self.ESCORT_LATERAL_OFFSET
+        # Target position: offset from carrier laterally, i.e. the unit
+        # carrier->base vector rotated by +/-90 degrees (no trig needed)
+        lateral_scale = side_multiplier * self.ESCORT_LATERAL_OFFSET / base_distance
+        target_x = carrier_pos.x - base_dy * lateral_scale
+        target_y = carrier_pos.y + base_dx * lateral_scale
         
-        # Calculate distance to carrier
+        # Calculate squared distance to carrier
         dx_carrier = agent.state.x - carrier_pos.x
         dy_carrier = agent.state.y - carrier_pos.y
-        distance_to_carrier = math.sqrt(dx_carrier * dx_carrier + dy_carrier * dy_carrier)
+        distance_to_carrier_sq = dx_carrier * dx_carrier + dy_carrier * dy_carrier
         
         # If too close to carrier, move away
-        if distance_to_carrier < self.CARRIER_MIN_DISTANCE:
+        if distance_to_carrier_sq < self.CARRIER_MIN_DISTANCE_SQ:
             # Move perpendicular away from carrier
-            away_angle = math.atan2(dy_carrier, dx_carrier)
-            away_dir = self._angle_to_direction(away_angle)
+            away_dir = _dxdy_to_direction(dx_carrier, dy_carrier)
             agent.move(dt, away_dir)
         # If too far, move toward escort position
-        elif distance_to_carrier > self.CARRIER_ESCORT_DISTANCE:
+        elif distance_to_carrier_sq > self.CARRIER_ESCORT_DISTANCE_SQ:
             agent.move_towards(dt, target_x, target_y)
         else:
             # Maintain escort position, move parallel to carrier
@@ -400,16 +464,17 @@ class CTFStrategy(Strategy):
             agent: Agent instance.
             dt: Delta time.
         """
-        own_flag = self._get_own_flag(agent)
+        own_flag = self._own_flag
         
         # Flag not carried anymore? Switch role
         if own_flag.state != 1:  # Not CARRIED
             self.role = CTFRole.ATTACKER
             return
         
-        # Find carrier
-        if own_flag.carrier_id and own_flag.carrier_id in agent.agents_dict:
-            carrier = agent.agents_dict[own_flag.carrier_id].state
+        # Find carrier (agent #0 is a valid carrier, so test for None)
+        carrier_id = own_flag.carrier_id
+        if carrier_id is not None and carrier_id in agent.agents_dict:
+            carrier = agent.agents_dict[carrier_id].state
             
             # Rush toward carrier
             agent.move_towards(dt, carrier.x, carrier.y)
@@ -432,17 +497,17 @@ class CTFStrategy(Strategy):
         Args:
             agent: Agent instance.
         """
-        # Find closest enemy
-        target_id = agent.get_closest_enemy()
-        if not target_id or target_id not in agent.agents_dict:
+        # Find closest enemy (one pass over the detected set only)
+        target_agent = agent.agents_dict.get(agent.get_closest_enemy())
+        if target_agent is None:
             return
         
-        target = agent.agents_dict[target_id].state
+        target = target_agent.state
         
-        # Calculate distance to target
+        # Calculate squared distance to target
         dx = target.x - agent.state.x
         dy = target.y - agent.state.y
-        distance = math.sqrt(dx * dx + dy * dy)
+        distance_sq = dx * dx + dy * dy
         
         # Always aim at enemy
         agent.point_gun_at(target.x, target.y)
@@ -450,17 +515,15 @@ class CTFStrategy(Strategy):
         # Shoot if we have ammo and are not reloading
         # Be aggressive - shoot at any enemy in reasonable range
         if agent.current_ammo > 0 and agent.reload_timer is None:
-            # Check if gun is roughly aimed (within 30 degrees)
-            target_angle = math.atan2(dy, dx)
-            angle_diff = abs(target_angle - agent.state.gun_angle)
-            # Normalize angle difference to [-pi, pi]
-            while angle_diff > math.pi:
-                angle_diff -= 2 * math.pi
-            while angle_diff < -math.pi:
-                angle_diff += 2 * math.pi
+            # Check if gun is roughly aimed (within 30 degrees) with a dot
+            # product of barrel and target vectors. Gun angles are in screen
+            # space, so the barrel's y component is -sin
+            gun_angle = agent.state.gun_angle
+            dot = _cos(gun_angle) * dx - _sin(gun_angle) * dy
+            aimed = dot > 0 and dot * dot > _COS_AIM_TOLERANCE_SQ * distance_sq
             
-            # Shoot if roughly aimed (30 degrees = 0.52 radians)
-            if abs(angle_diff) < 0.52 or distance < 150.0:
+            # Shoot if roughly aimed or the target is close
+            if aimed or distance_sq < self.CLOSE_RANGE_SQ:
                 agent.load_bullet()
     
     def _evade_enemies(self, agent, dt: float) -> None:
@@ -476,7 +539,7 @@ class CTFStrategy(Strategy):
         
         # Find closest enemy
         target_id = agent.get_closest_enemy()
-        if not target_id or target_id not in agent.agents_dict:
+        if target_id is None or target_id not in agent.agents_dict:
             return
         
         enemy = agent.agents_dict[target_id].state
@@ -485,48 +548,29 @@ class CTFStrategy(Strategy):
         dx = agent.state.x - enemy.x
         dy = agent.state.y - enemy.y
         
-        # Add perpendicular component for strafing
-        angle_away = math.atan2(dy, dx)
-        strafe_angle = angle_away + math.pi / 4 * random.choice([-1, 1])
-        
-        direction = self._angle_to_direction(strafe_angle)
+        # Add perpendicular component for strafing: rotate the away vector
+        # by +/-45 degrees (scaled by sqrt(2), which the octant ignores)
+        strafe_sign = 1 if _random() < 0.5 else -1
+        direction = _dxdy_to_direction(dx - strafe_sign * dy, dy + strafe_sign * dx)
         agent.move(dt, direction)
     
-    def _get_enemy_flag(self, agent):
-        """Get enemy flag reference."""
-        if agent.state.team == Team.TEAM_A:
-            return self.game_manager.flag_team_b
-        else:
-            return self.game_manager.flag_team_a
-    
-    def _get_own_flag(self, agent):
-        """Get own flag reference."""
-        if agent.state.team == Team.TEAM_A:
-            return self.game_manager.flag_team_a
-        else:
-            return self.game_manager.flag_team_b
-    
-    def _get_own_base(self, agent) -> tuple[float, float]:
-        """Get own base coordinates."""
-        if agent.state.team == Team.TEAM_A:
-            return (CTF_FLAG_TEAM_A_BASE_X, CTF_FLAG_TEAM_A_BASE_Y)
+    def _cache_team_refs(self, team: int) -> None:
+        """
+        Cache the enemy team, flag references and own base coordinates for a team.
+        
+        Args:
+            team: Team of the controlled agent.
+        """
+        self._team = team
+        if team == Team.TEAM_A:
+            self._enemy_team = Team.TEAM_B
+            self._own_flag = self.game_manager.flag_team_a
+            self._enemy_flag = self.game_manager.flag_team_b
+            self._own_base_x = CTF_FLAG_TEAM_A_BASE_X
+            self._own_base_y = CTF_FLAG_TEAM_A_BASE_Y
         else:
-            return (CTF_FLAG_TEAM_B_BASE_X, CTF_FLAG_TEAM_B_BASE_Y)
-    
-    def _angle_to_direction(self, angle: float) -> Direction:
-        """Convert angle to nearest 8-direction."""
-        angle = angle % (2 * math.pi)
-        section = int((angle + math.pi / 8) / (math.pi / 4)) % 8
-        
-        directions = [
-            Direction.EAST,
-            Direction.NORTH_EAST,
-            Direction.NORTH,
-            Direction.NORTH_WEST,
-            Direction.WEST,
-            Direction.SOUTH_WEST,
-            Direction.SOUTH,
-            Direction.SOUTH_EAST,
-        ]
-        
-        return directions[section]
+            self._enemy_team = Team.TEAM_A
+            self._own_flag = self.game_manager.flag_team_b
+            self._enemy_flag = self.game_manager.flag_team_a
+            self._own_base_x = CTF_FLAG_TEAM_B_BASE_X
+            self._own_base_y = CTF_FLAG_TEAM_B_BASE_Y
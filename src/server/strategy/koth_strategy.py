@@ -17,6 +17,26 @@ from common.koth_config import (
     KOTH_ZONE_SHAPE,
 )
 
+# All eight directions, built once for random picks
+_ALL_DIRECTIONS = tuple(Direction)
+
+# Directions by counter-clockwise octant, starting at EAST (angle 0)
+_OCTANTS = (
+    Direction.EAST,
+    Direction.NORTH_EAST,
+    Direction.NORTH,
+    Direction.NORTH_WEST,
+    Direction.WEST,
+    Direction.SOUTH_WEST,
+    Direction.SOUTH,
+    Direction.SOUTH_EAST,
+)
+
+# atan2 returns [-pi, pi]; shifting by 2pi + pi/8 keeps the bucket positive
+# and centres each octant on its direction
+_OCTANT_OFFSET = 2 * math.pi + math.pi / 8
+_OCTANTS_PER_RADIAN = 4 / math.pi
+
 
 class KOTHStrategy(Strategy):
     """
@@ -31,6 +51,7 @@ class KOTHStrategy(Strategy):
     
     # Configuration
     ZONE_ORBIT_RADIUS = 80.0  # How close to center to patrol
+    ZONE_ORBIT_RADIUS_SQ = ZONE_ORBIT_RADIUS ** 2
     LOW_HEALTH_THRESHOLD = 20.0  # When to temporarily leave zone
     CHANGE_DIRECTION_INTERVAL = 0.8  # Change patrol direction
     
@@ -38,7 +59,7 @@ class KOTHStrategy(Strategy):
         """Initialize strategy state."""
         self.zone_center_x = KOTH_ZONE_CENTER_X
         self.zone_center_y = KOTH_ZONE_CENTER_Y
-        self.patrol_direction = random.choice(list(Direction))
+        self.patrol_direction = random.choice(_ALL_DIRECTIONS)
         self.direction_timer = 0.0
         self.in_zone = False
     
@@ -60,10 +81,10 @@ class KOTHStrategy(Strategy):
         # Check if we're in the zone
         self.in_zone = self._is_in_zone(agent)
         
-        # Calculate distance to zone center
+        # Calculate squared distance to zone center
         dx = self.zone_center_x - agent.state.x
         dy = self.zone_center_y - agent.state.y
-        distance_to_center = math.sqrt(dx * dx + dy * dy)
+        distance_to_center_sq = dx * dx + dy * dy
         
         # Very low health - temporarily retreat
         if agent.health < self.LOW_HEALTH_THRESHOLD:
@@ -89,7 +110,7 @@ class KOTHStrategy(Strategy):
             self._rush_to_zone(agent, dt)
         else:
             # In zone - HOLD IT
-            self._hold_zone(agent, dt, distance_to_center)
+            self._hold_zone(agent, dt, distance_to_center_sq)
     
     def _is_in_zone(self, agent) -> bool:
         """Check if agent is inside the hill zone."""
@@ -120,25 +141,25 @@ class KOTHStrategy(Strategy):
         if not agent.detected_enemies:
             agent.point_gun_at(self.zone_center_x, self.zone_center_y)
     
-    def _hold_zone(self, agent, dt: float, distance_to_center: float) -> None:
+    def _hold_zone(self, agent, dt: float, distance_to_center_sq: float) -> None:
         """
         Stay in zone and defend it.
         
         Args:
             agent: Agent instance.
             dt: Delta time.
-            distance_to_center: Distance to zone center.
+            distance_to_center_sq: Squared distance to zone center.
         """
         self.direction_timer += dt
         
         # If we're drifting toward edge, move back to center
-        if distance_to_center > self.ZONE_ORBIT_RADIUS:
+        if distance_to_center_sq > self.ZONE_ORBIT_RADIUS_SQ:
             agent.move_towards(dt, self.zone_center_x, self.zone_center_y)
             return
         
         # We're in a good position - patrol around center
         if self.direction_timer >= self.CHANGE_DIRECTION_INTERVAL:
-            self.patrol_direction = random.choice(list(Direction))
+            self.patrol_direction = random.choice(_ALL_DIRECTIONS)
             self.direction_timer = 0.0
         
         # Patrol
@@ -146,7 +167,7 @@ class KOTHStrategy(Strategy):
         
         # If we hit a wall, change direction immediately
         if agent.is_blocked():
-            self.patrol_direction = random.choice(list(Direction))
+            self.patrol_direction = random.choice(_ALL_DIRECTIONS)
             agent.move(dt, self.patrol_direction)
     
     def _emergency_retreat(self, agent, dt: float) -> None:
@@ -184,19 +205,5 @@ class KOTHStrategy(Strategy):
         agent.move(dt, direction)
     
     def _angle_to_direction(self, angle: float) -> Direction:
-        """Convert angle to nearest 8-direction."""
-        angle = angle % (2 * math.pi)
-        section = int((angle + math.pi / 8) / (math.pi / 4)) % 8
-        
-        directions = [
-            Direction.EAST,
-            Direction.NORTH_EAST,
-            Direction.NORTH,
-            Direction.NORTH_WEST,
-            Direction.WEST,
-            Direction.SOUTH_WEST,
-            Direction.SOUTH,
-            Direction.SOUTH_EAST,
-        ]
-        
-        return directions[section]
\ No newline at end of file
+        """Convert an atan2 angle to nearest 8-direction."""
+        return _OCTANTS[int((angle + _OCTANT_OFFSET) * _OCTANTS_PER_RADIAN) & 7]
\ No newline at end of file
@@ -5,6 +5,9 @@ import random
 from server.strategy.base import Strategy
 from common.config import Direction
 
+# All eight directions, built once for random picks
+_ALL_DIRECTIONS = tuple(Direction)
+
 
 class RandomStrategy(Strategy):
     """
@@ -46,7 +49,7 @@ class RandomStrategy(Strategy):
 
         # Update direction at interval
         if self.direction_timer >= self.DIRECTION_CHANGE_INTERVAL:
-            self.current_direction = random.choice(list(Direction))
+            self.current_direction = random.choice(_ALL_DIRECTIONS)
             self.direction_timer = 0.0
 
         # Move in current direction
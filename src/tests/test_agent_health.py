@@ -31,5 +31,26 @@ class TestAgentHealth(unittest.TestCase):
         agent.take_damage(80.0)
         self.assertEqual(agent.health, 0.0)  # Health should not go below 0
 
+    def test_agent_on_death_called_once(self):
+        """Test if the death callback fires only when health first reaches zero."""
+        walls_state = StateWalls(grid_unit=10, world_width=100, world_height=100)
+        deaths = []
+
+        agent = Agent(
+            walls_state=walls_state,
+            agents_dict={},
+            bullets_dict={},
+            strategy=MockStrategy(),
+            health=50.0,
+            on_death=deaths.append,
+        )
+
+        agent.take_damage(30.0)
+        self.assertEqual(deaths, [])
+
+        agent.take_damage(30.0)
+        agent.take_damage(30.0)
+        self.assertEqual(deaths, [agent.state.id_entity])
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
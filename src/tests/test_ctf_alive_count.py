@@ -0,0 +1,32 @@
+import os
+import unittest
+from src.server.gameplay.game_manager_ctf import GameManagerCTF
+from src.common.states.state_entity import Team
+
+
+WALL_CONFIG = os.path.join(
+    os.path.dirname(__file__), "..", "common", "wall_configs", "walls_config1.txt"
+)
+
+
+class TestCTFAliveCount(unittest.TestCase):
+    def test_alive_count_tracks_spawns_and_deaths(self):
+        """Test if the per-team alive counter follows spawns and deaths."""
+        game_manager = GameManagerCTF(WALL_CONFIG)
+        game_manager.spawn_test_agents()
+
+        for team in (Team.TEAM_A, Team.TEAM_B):
+            expected = sum(1 for agent in game_manager.agents.values() if agent.state.team == team)
+            self.assertEqual(game_manager.team_alive_count[team], expected)
+
+        victim = next(
+            agent for agent in game_manager.agents.values() if agent.state.team == Team.TEAM_A
+        )
+        before = game_manager.team_alive_count[Team.TEAM_A]
+        victim.take_damage(victim.health)
+        victim.take_damage(1.0)
+
+        self.assertEqual(game_manager.team_alive_count[Team.TEAM_A], before - 1)
+
+if __name__ == "__main__":
+    unittest.main()
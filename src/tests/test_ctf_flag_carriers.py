@@ -0,0 +1,38 @@
+import os
+import unittest
+from src.server.gameplay.game_manager_ctf import GameManagerCTF
+from src.common.states.state_entity import Team
+
+
+WALL_CONFIG = os.path.join(
+    os.path.dirname(__file__), "..", "common", "wall_configs", "walls_config1.txt"
+)
+
+
+class TestCTFFlagCarriers(unittest.TestCase):
+    def test_flag_carriers_follow_pickup_and_return(self):
+        """Test if the per-team carrier is resolved after pickups and returns."""
+        game_manager = GameManagerCTF(WALL_CONFIG)
+        game_manager.spawn_test_agents()
+
+        carrier = next(
+            agent for agent in game_manager.agents.values() if agent.state.team == Team.TEAM_A
+        )
+        flag = game_manager.flag_team_b
+        spawn_x, spawn_y = carrier.state.x, carrier.state.y
+        # Away from its own base, so the pickup is not captured right away
+        carrier.state.x, carrier.state.y = flag.x, flag.y
+        flag.pickup(carrier.state.id_entity, carrier.state.x, carrier.state.y)
+        game_manager.update_flags(0.0)
+
+        self.assertIs(game_manager.flag_carriers[Team.TEAM_A], carrier)
+        self.assertIsNone(game_manager.flag_carriers[Team.TEAM_B])
+
+        carrier.state.x, carrier.state.y = spawn_x, spawn_y
+        flag.reset_to_base()
+        game_manager.update_flags(0.0)
+
+        self.assertIsNone(game_manager.flag_carriers[Team.TEAM_A])
+
+if __name__ == "__main__":
+    unittest.main()
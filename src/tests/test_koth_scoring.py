@@ -0,0 +1,74 @@
+import os
+import unittest
+from src.server.gameplay.game_manager_koth import GameManagerKOTH
+from src.common.states.state_koth import KOTHZoneStatus
+from src.common.koth_config import (
+    KOTH_POINTS_PER_SECOND,
+    KOTH_SCORING_INTERVAL,
+    KOTH_ZONE_CENTER_X,
+    KOTH_ZONE_CENTER_Y,
+)
+
+
+WALL_CONFIG = os.path.join(
+    os.path.dirname(__file__), "..", "common", "wall_configs", "walls_config1.txt"
+)
+
+
+class TestKOTHScoring(unittest.TestCase):
+    def test_scoring_awards_all_elapsed_intervals(self):
+        """Test if a long tick awards points for every elapsed interval at once."""
+        game_manager = GameManagerKOTH(WALL_CONFIG)
+        game_manager.koth_state.zone_status = KOTHZoneStatus.TEAM_A
+
+        self.assertTrue(game_manager.update_scoring(KOTH_SCORING_INTERVAL * 3.5))
+
+        expected = 3 * KOTH_POINTS_PER_SECOND * KOTH_SCORING_INTERVAL
+        self.assertAlmostEqual(game_manager.koth_state.team_a_score, expected)
+        self.assertEqual(game_manager.koth_state.team_b_score, 0.0)
+        self.assertAlmostEqual(game_manager.scoring_timer, KOTH_SCORING_INTERVAL * 0.5)
+
+    def test_scoring_skips_contested_zone(self):
+        """Test if a contested zone consumes the timer without awarding points."""
+        game_manager = GameManagerKOTH(WALL_CONFIG)
+        game_manager.koth_state.zone_status = KOTHZoneStatus.CONTESTED
+
+        self.assertFalse(game_manager.update_scoring(KOTH_SCORING_INTERVAL * 2))
+
+        self.assertEqual(game_manager.koth_state.team_a_score, 0.0)
+        self.assertEqual(game_manager.koth_state.team_b_score, 0.0)
+        self.assertAlmostEqual(game_manager.scoring_timer, 0.0)
+
+
+class TestKOTHZoneControl(unittest.TestCase):
+    def _move_into_zone(self, game_manager, agent):
+        agent.state.x = KOTH_ZONE_CENTER_X
+        agent.state.y = KOTH_ZONE_CENTER_Y
+        game_manager._zone_grid.update(agent)
+
+    def test_zone_control_single_team(self):
+        """Test if a zone held by one team reports that team."""
+        game_manager = GameManagerKOTH(WALL_CONFIG)
+        game_manager.spawn_test_agents()
+        team_a = [a for a in game_manager.agents.values() if a.state.team == 1]
+
+        for agent in team_a:
+            self._move_into_zone(game_manager, agent)
+        game_manager.update_zone_control()
+
+        self.assertEqual(game_manager.koth_state.zone_status, KOTHZoneStatus.TEAM_A)
+
+    def test_zone_control_contested(self):
+        """Test if agents of both teams in the zone mark it contested."""
+        game_manager = GameManagerKOTH(WALL_CONFIG)
+        game_manager.spawn_test_agents()
+
+        for agent in game_manager.agents.values():
+            self._move_into_zone(game_manager, agent)
+        game_manager.update_zone_control()
+
+        self.assertEqual(game_manager.koth_state.zone_status, KOTHZoneStatus.CONTESTED)
+
+
+if __name__ == "__main__":
+    unittest.main()
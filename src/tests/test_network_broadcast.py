@@ -0,0 +1,114 @@
+import os
+import unittest
+from collections import deque
+from server.network.client_broadcast import ClientBroadcastMixin, write_batch_states
+from client.network.batch import iter_batch
+from server.gameplay.game_manager_koth import GameManagerKOTH
+from server.config import CLIENT_BACKLOG_HIGH_WATER
+from common.config import MSG_TYPE_BULLETS, MSG_TYPE_ENTITIES
+from common.states.state_entity import StateEntity
+
+
+WALL_CONFIG = os.path.join(
+    os.path.dirname(__file__), "..", "common", "wall_configs", "walls_config1.txt"
+)
+
+
+class _Broadcaster(ClientBroadcastMixin):
+    """Bare mixin host with hand-registered client queues."""
+
+    def __init__(self, game_manager, client_count):
+        self.game_manager = game_manager
+        self._init_broadcast()
+        self.queues = [deque(maxlen=8) for _ in range(client_count)]
+        for i, pending in enumerate(self.queues):
+            self.client_queues[i] = pending
+        self._refresh_client_snapshot()
+
+    def broadcast(self):
+        refresh = self._take_refresh()
+        entity_states, bullet_states = self._collect_states()
+        self._send_batch(self._pack_batch(entity_states, bullet_states, refresh))
+
+
+class TestBroadcastFrame(unittest.TestCase):
+    def setUp(self):
+        self.game_manager = GameManagerKOTH(WALL_CONFIG)
+        self.game_manager.spawn_test_agents()
+
+    def test_clients_share_one_bytes_frame(self):
+        """Test if every client is queued the same immutable frame object."""
+        broadcaster = _Broadcaster(self.game_manager, 3)
+        broadcaster.broadcast()
+
+        frames = [pending[0] for pending in broadcaster.queues]
+        self.assertIsInstance(frames[0], bytes)
+        for frame in frames[1:]:
+            self.assertIs(frame, frames[0])
+
+    def test_client_splits_batch_into_messages(self):
+        """Test if iter_batch returns the messages packed into a frame."""
+        broadcaster = _Broadcaster(self.game_manager, 1)
+        broadcaster.broadcast()
+
+        messages = list(iter_batch(broadcaster.queues[0][0]))
+        self.assertEqual([message[0] for message in messages], [MSG_TYPE_ENTITIES, MSG_TYPE_BULLETS])
+        entity_states = [agent.state for agent in self.game_manager.agents.values()]
+        self.assertEqual(messages[0][1:], StateEntity.pack_entities(entity_states))
+
+    def test_unchanged_states_are_skipped_unless_refreshed(self):
+        """Test if write_batch_states leaves out a payload equal to the last one."""
+        states = [agent.state for agent in self.game_manager.agents.values()]
+        buf = bytearray(StateEntity.packed_entities_size(len(states)) + 16)
+
+        end, previous = write_batch_states(
+            buf, 0, MSG_TYPE_ENTITIES, StateEntity.pack_entities_into, states, b"", False
+        )
+        self.assertGreater(end, 0)
+
+        skipped, _ = write_batch_states(
+            buf, 0, MSG_TYPE_ENTITIES, StateEntity.pack_entities_into, states, previous, False
+        )
+        self.assertEqual(skipped, 0)
+
+        refreshed, _ = write_batch_states(
+            buf, 0, MSG_TYPE_ENTITIES, StateEntity.pack_entities_into, states, previous, True
+        )
+        self.assertEqual(refreshed, end)
+
+    def test_dropped_frame_forces_full_state(self):
+        """Test if a client skipped at the backlog limit gets full state next."""
+        broadcaster = _Broadcaster(self.game_manager, 2)
+        broadcaster.broadcast()
+        broadcaster.broadcast()
+        # Nothing changed since the first frame, so nothing was queued
+        self.assertEqual(len(broadcaster.queues[0]), 1)
+
+        slow = broadcaster.queues[1]
+        slow.clear()
+        slow.extend([b"pending"] * CLIENT_BACKLOG_HIGH_WATER)
+        agent = next(iter(self.game_manager.agents.values()))
+        agent.state.x += 5.0
+        broadcaster.broadcast()
+        self.assertEqual(len(slow), CLIENT_BACKLOG_HIGH_WATER)
+
+        # State is unchanged again, but the slow client missed the move
+        slow.clear()
+        broadcaster.broadcast()
+        self.assertEqual(len(slow), 1)
+        self.assertIs(slow[0], broadcaster.queues[0][-1])
+        self.assertEqual(len(slow[0]), len(broadcaster.queues[0][0]))
+
+    def test_evicted_frame_forces_full_state(self):
+        """Test if losing the oldest queued message to the bound requests a resync."""
+        broadcaster = _Broadcaster(self.game_manager, 1)
+        pending = broadcaster.queues[0]
+        pending.extend([b"control"] * pending.maxlen)
+
+        broadcaster._send_to_all(b"control")
+
+        self.assertTrue(broadcaster._take_refresh())
+
+
+if __name__ == "__main__":
+    unittest.main()
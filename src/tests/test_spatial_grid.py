@@ -0,0 +1,82 @@
+import unittest
+from src.server.gameplay.agent import Agent
+from src.server.gameplay.spatial_grid import SpatialGrid
+from src.common.states.state_walls import StateWalls
+from src.server.strategy.base import Strategy
+from src.common.config import FOV_RATIO
+
+
+class MockStrategy(Strategy):
+    def execute(self, agent, dt):
+        pass
+
+
+class TestSpatialGrid(unittest.TestCase):
+    def setUp(self):
+        self.walls_state = StateWalls(grid_unit=10, world_width=400, world_height=400)
+        self.agents_dict = {}
+        self.grid = SpatialGrid(cell_size=100, world_width=400, world_height=400)
+
+    def _make_agent(self, x, y):
+        agent = Agent(
+            walls_state=self.walls_state,
+            agents_dict=self.agents_dict,
+            bullets_dict={},
+            strategy=MockStrategy(),
+            x=x,
+            y=y,
+        )
+        self.agents_dict[agent.state.id_entity] = agent
+        return agent
+
+    def test_query_returns_only_nearby_agents(self):
+        """Test if a rectangle query skips agents in far-away cells."""
+        near = self._make_agent(150.0, 150.0)
+        far = self._make_agent(350.0, 350.0)
+        self.grid.insert(near)
+        self.grid.insert(far)
+
+        found = list(self.grid.query_rect(120.0, 120.0, 180.0, 180.0))
+        self.assertEqual(found, [near])
+
+    def test_update_moves_agent_between_cells(self):
+        """Test if an agent is rebound to its new cell after moving."""
+        agent = self._make_agent(50.0, 50.0)
+        self.grid.insert(agent)
+
+        agent.state.set_position(250.0, 250.0)
+        self.grid.update(agent)
+
+        self.assertEqual(list(self.grid.query_rect(0.0, 0.0, 90.0, 90.0)), [])
+        self.assertEqual(list(self.grid.query_rect(210.0, 210.0, 290.0, 290.0)), [agent])
+
+        self.grid.remove(agent)
+        self.assertEqual(list(self.grid.query_rect(0.0, 0.0, 400.0, 400.0)), [])
+
+    def test_fov_candidates_include_large_agents_at_the_edge(self):
+        """Test if an oversized agent is found when only its body is in reach."""
+        walls_state = StateWalls(grid_unit=10, world_width=4000, world_height=400)
+        grid = SpatialGrid(cell_size=100, world_width=4000, world_height=400)
+        viewer = Agent(
+            walls_state=walls_state,
+            agents_dict=self.agents_dict,
+            bullets_dict={},
+            strategy=MockStrategy(),
+            x=100.0,
+            y=100.0,
+            spatial_grid=grid,
+        )
+        self.agents_dict[viewer.state.id_entity] = viewer
+        fov_radius = FOV_RATIO * viewer.state.radius
+
+        # Centre outside the FOV, but a 200 px body reaches into it
+        large = self._make_agent(100.0 + fov_radius + 150.0, 100.0)
+        large.state.radius = 200.0
+        grid.insert(viewer)
+        grid.insert(large)
+
+        candidate_ids = [agent_id for agent_id, _ in viewer._fov_candidates(fov_radius)]
+        self.assertIn(large.state.id_entity, candidate_ids)
+
+if __name__ == "__main__":
+    unittest.main()
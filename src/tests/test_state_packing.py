@@ -0,0 +1,51 @@
+import unittest
+from src.common.states.state_entity import StateEntity
+from src.common.states.state_bullet import StateBullet
+
+
+class TestStatePacking(unittest.TestCase):
+    def test_entities_round_trip(self):
+        """Test if packed entities unpack to the same values."""
+        entities = [
+            StateEntity(i, 10.0 * i, 20.0 * i, 16.0, 1 + i % 2, 0.5 * i, 100.0 - i, 8)
+            for i in range(5)
+        ]
+
+        unpacked = StateEntity.unpack_entities(StateEntity.pack_entities(entities))
+
+        self.assertEqual(len(unpacked), len(entities))
+        for original, result in zip(entities, unpacked):
+            self.assertEqual(result.id_entity, original.id_entity)
+            self.assertAlmostEqual(result.x, original.x, places=4)
+            self.assertAlmostEqual(result.y, original.y, places=4)
+            self.assertEqual(result.team, original.team)
+            self.assertAlmostEqual(result.health, original.health, places=4)
+            self.assertEqual(result.ammo, original.ammo)
+
+    def test_bullets_round_trip(self):
+        """Test if packed bullets unpack to the same values."""
+        bullets = [StateBullet(i, 3.0 * i, 4.0 * i, 5.0, i, 2) for i in range(4)]
+
+        unpacked = StateBullet.unpack_bullets(StateBullet.pack_bullets(bullets))
+
+        self.assertEqual(len(unpacked), len(bullets))
+        for original, result in zip(bullets, unpacked):
+            self.assertEqual(result.id_bullet, original.id_bullet)
+            self.assertAlmostEqual(result.x, original.x, places=4)
+            self.assertAlmostEqual(result.y, original.y, places=4)
+            self.assertEqual(result.owner_id, original.owner_id)
+            self.assertEqual(result.team, original.team)
+
+    def test_pack_into_matches_pack(self):
+        """Test if packing into a buffer at an offset gives the same bytes."""
+        entities = [StateEntity(i, 1.0 * i, 2.0 * i, 16.0, 1, 0.0, 50.0, 3) for i in range(3)]
+        expected = StateEntity.pack_entities(entities)
+
+        out = bytearray(2 + StateEntity.packed_entities_size(len(entities)))
+        end = StateEntity.pack_entities_into(entities, out, 2)
+
+        self.assertEqual(end, len(out))
+        self.assertEqual(bytes(out[2:]), expected)
+
+if __name__ == "__main__":
+    unittest.main()